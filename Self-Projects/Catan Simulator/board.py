@@ -1,13 +1,14 @@
 import pygame
 import math
 from game_state import HexTile
+from catan_rules import SpatialGrid
 
 # --- Constants ---
 HEX_SIZE = 45
 COLORS = {
     "Wood": (34, 139, 34), "Brick": (178, 34, 34), "Sheep": (154, 205, 50),
     "Wheat": (218, 165, 32), "Ore": (112, 128, 144), "Desert": (244, 164, 96),
-    "None": (200, 200, 200)
+    "None": (200, 200, 200), "Water": (30, 144, 255)
 }
 
 # Add this concept to board.py
@@ -31,6 +32,12 @@ class BoardRenderer:
         self.hex_data = [] # Stores dicts of {rect, tile_obj, center}
         self.resource_cycle = ["Wood", "Brick", "Sheep", "Wheat", "Ore", "Desert", "None"]
         self.number_cycle = [2, 3, 4, 5, 6, 8, 9, 10, 11, 12, None]
+        self.cache = None  # Pre-rendered board, built on the first draw()
+        self.scratch = None  # Same-size surface render_region draws on
+        self.dirty = set()  # Indices into hex_data to re-render onto the cache
+        self.hex_grid = SpatialGrid(HEX_SIZE)  # Hit-test index of hex centers, filled by generate_layout
+        self.hovered = None  # Index of the highlighted hex
+        self.unhovered = []  # Screen rects to clear of an old hover outline
 
     def generate_layout(self, start_x, start_y):
         layout = [
@@ -47,42 +54,118 @@ class BoardRenderer:
             x = start_x + hex_width * (q + r/2)
             y = start_y + hex_height * (3/4 * r)
             tile = HexTile(q=q, r=r, resource="None")
-            self.hex_data.append({"tile": tile, "center": (x, y)})
-        return [h["tile"] for h in self.hex_data]
 
-    def draw(self):
-        for h in self.hex_data:
-            tile = h["tile"]
-            cx, cy = h["center"]
-            
-            # Calculate vertices
+            # Vertices never move, so compute them once
             vertices = []
             for i in range(6):
                 angle_deg = 60 * i - 30
                 angle_rad = math.pi / 180 * angle_deg
-                vertices.append((cx + HEX_SIZE * math.cos(angle_rad), cy + HEX_SIZE * math.sin(angle_rad)))
-            
-            pygame.draw.polygon(self.surface, COLORS[tile.resource], vertices)
-            pygame.draw.polygon(self.surface, (0, 0, 0), vertices, 2)
-
-            if tile.number and tile.resource != "Desert":
-                text = self.font.render(str(tile.number), True, (0, 0, 0))
-                text_rect = text.get_rect(center=(cx, cy))
-                
-                # Draw white circle behind number
-                pygame.draw.circle(self.surface, (255, 255, 255), (cx, cy), 15)
-                self.surface.blit(text, text_rect)
+                vertices.append((x + HEX_SIZE * math.cos(angle_rad), y + HEX_SIZE * math.sin(angle_rad)))
+            rect = pygame.Rect(x - HEX_SIZE, y - HEX_SIZE, 2 * HEX_SIZE, 2 * HEX_SIZE).inflate(4, 4)
+            self.hex_grid.insert(len(self.hex_data), (x, y), HEX_SIZE)
+            self.hex_data.append({"tile": tile, "center": (x, y), "vertices": vertices, "rect": rect})
+        self.cache = None
+        return [h["tile"] for h in self.hex_data]
+
+    def render_hex(self, target, h):
+        tile = h["tile"]
+        cx, cy = h["center"]
+        pygame.draw.polygon(target, COLORS[tile.resource], h["vertices"])
+        pygame.draw.polygon(target, (0, 0, 0), h["vertices"], 2)
+
+        if tile.number and tile.resource != "Desert":
+            text = self.font.render(str(tile.number), True, (0, 0, 0))
+            text_rect = text.get_rect(center=(cx, cy))
+
+            # Draw white circle behind number
+            pygame.draw.circle(target, (255, 255, 255), (cx, cy), 15)
+            target.blit(text, text_rect)
+
+    def draw(self):
+        """
+        Bring the screen up to date with the cached board and return the
+        rects that changed, for pygame.display.update. The first call renders
+        everything; after that only hexes edited by handle_click are redrawn.
+        """
+        if self.cache is None:
+            self.cache = pygame.Surface(self.surface.get_size())
+            self.cache.fill(COLORS["Water"])
+            for h in self.hex_data:
+                self.render_hex(self.cache, h)
+            self.dirty.clear()
+            self.surface.blit(self.cache, (0, 0))
+            if self.hovered is not None:
+                self.draw_hover()
+            return [self.surface.get_rect()]
+
+        rects = []
+        for i in sorted(self.dirty):
+            rect = self.hex_data[i]["rect"]
+            self.render_region(rect)
+            self.restore(rect)
+            rects.append(rect)
+        self.dirty.clear()
+        for rect in self.unhovered:
+            self.restore(rect)
+            rects.append(rect)
+        self.unhovered.clear()
+        # Restoring a rect also wipes any part of the outline that spills onto it
+        if self.hovered is not None and self.hex_data[self.hovered]["rect"].collidelist(rects) != -1:
+            rects.append(self.draw_hover())
+        return rects
+
+    def render_region(self, rect):
+        """
+        Re-render `rect` of the cached board as a full render would: water,
+        then every hex overlapping it in order, so shared borders come out
+        the same. Hexes are drawn unclipped on a scratch surface (pygame
+        rasterizes clipped thick lines differently) and `rect` copied over.
+        """
+        if self.scratch is None:
+            self.scratch = pygame.Surface(self.cache.get_size())
+        self.scratch.fill(COLORS["Water"], rect)
+        for h in self.hex_data:
+            if h["rect"].colliderect(rect):
+                self.render_hex(self.scratch, h)
+        self.cache.blit(self.scratch, rect, rect)
+
+    def draw_hover(self):
+        """Outline the hovered hex on the screen only, so the cached board never holds it; returns its rect."""
+        h = self.hex_data[self.hovered]
+        pygame.draw.polygon(self.surface, (255, 255, 255), h["vertices"], 3)
+        return h["rect"]
+
+    def restore(self, rect):
+        """Repaint `rect` of the screen from the cached board, e.g. under an overlay."""
+        self.surface.blit(self.cache, rect, rect)
 
     def handle_click(self, pos, button):
         # Button 1 is Left Click (Resource), Button 3 is Right Click (Number)
-        for h in self.hex_data:
-            cx, cy = h["center"]
-            # Simple distance check for clicking inside a hex
-            if math.hypot(cx - pos[0], cy - pos[1]) < HEX_SIZE:
-                tile = h["tile"]
-                if button == 1:
-                    idx = (self.resource_cycle.index(tile.resource) + 1) % len(self.resource_cycle)
-                    tile.resource = self.resource_cycle[idx]
-                elif button == 3:
-                    idx = (self.number_cycle.index(tile.number) + 1) % len(self.number_cycle)
-                    tile.number = self.number_cycle[idx]
\ No newline at end of file
+        i = self.hex_at(pos)
+        if i is None:
+            return
+        tile = self.hex_data[i]["tile"]
+        if button == 1:
+            idx = (self.resource_cycle.index(tile.resource) + 1) % len(self.resource_cycle)
+            tile.resource = self.resource_cycle[idx]
+        elif button == 3:
+            idx = (self.number_cycle.index(tile.number) + 1) % len(self.number_cycle)
+            tile.number = self.number_cycle[idx]
+        self.dirty.add(i)
+
+    def hex_at(self, pos):
+        """Index into hex_data of the hex under `pos`, or None."""
+        return self.hex_grid.query(pos)
+
+    def set_hover(self, pos):
+        """
+        Highlight the hex under `pos` (None clears it). The outline lives on
+        the screen only: the next draw() restores the old hex's rect from the
+        cache and outlines the new one.
+        """
+        hovered = self.hex_at(pos) if pos else None
+        if hovered != self.hovered:
+            for i in (self.hovered, hovered):
+                if i is not None:
+                    self.unhovered.append(self.hex_data[i]["rect"])
+            self.hovered = hovered
\ No newline at end of file
@@ -0,0 +1,611 @@
+import copy
+import functools
+import math
+import random
+
+import numpy as np
+
+# --- Board geometry (pixel positions double as node identities) ---
+WIDTH, HEIGHT = 1200, 800
+HEX_SIZE = 50
+SIDEBAR_WIDTH = 350
+LAYOUT = [(0,-2),(1,-2),(2,-2), (-1,-1),(0,-1),(1,-1),(2,-1), (-2,0),(-1,0),(0,0),(1,0),(2,0), (-2,1),(-1,1),(0,1),(1,1), (-2,2),(-1,2),(0,2)]
+
+# Click/hover radius around tile centers, nodes and edge midpoints
+TILE_HIT_RADIUS, NODE_HIT_RADIUS, EDGE_HIT_RADIUS = 35, 20, 25
+
+PLAYER_COLORS = [(255, 50, 50), (50, 50, 255), (255, 255, 50), (240, 240, 240)]
+RESOURCE_WEIGHTS = {"Brick": 1.4, "Wood": 1.4, "Wheat": 1.1, "Ore": 1.2, "Sheep": 0.9, "Desert": 0}
+DOTS = {2:1, 12:1, 3:2, 11:2, 4:3, 10:3, 5:4, 9:4, 6:5, 8:5, 7:0, None:0}  # Pips under each number token
+
+RESOURCES = ("Wood", "Brick", "Sheep", "Wheat", "Ore")
+
+# Standard base-game tile and number distribution
+STANDARD_RESOURCES = ["Wood"] * 4 + ["Brick"] * 3 + ["Sheep"] * 4 + ["Wheat"] * 4 + ["Ore"] * 3 + ["Desert"]
+STANDARD_NUMBERS = [2, 3, 3, 4, 4, 5, 5, 6, 6, 8, 8, 9, 9, 10, 10, 11, 11, 12]
+
+COSTS = {
+    "Road": {"Wood": 1, "Brick": 1},
+    "Settlement": {"Wood": 1, "Brick": 1, "Sheep": 1, "Wheat": 1},
+    "City": {"Wheat": 2, "Ore": 3},
+}
+PIECE_LIMITS = {"Road": 15, "Settlement": 5, "City": 4}
+WINNING_POINTS = 10
+LONGEST_ROAD_MIN = 5
+LONGEST_ROAD_POINTS = 2
+BANK_TRADE_RATE = 4
+
+class SpatialGrid:
+    """
+    Uniform grid of circular screen targets. Each target is filed under
+    every cell its circle overlaps, so a point query checks one cell's short
+    list instead of every target on the board.
+    """
+
+    def __init__(self, cell_size=50):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def _cell(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def insert(self, item, pos, radius):
+        x0, y0 = self._cell(pos[0] - radius, pos[1] - radius)
+        x1, y1 = self._cell(pos[0] + radius, pos[1] + radius)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                self.cells.setdefault((cx, cy), []).append((item, pos, radius))
+
+    def query(self, pos, accept=None):
+        """Nearest target within its radius of `pos` that `accept` allows, or None."""
+        best, best_dist = None, math.inf
+        for item, center, radius in self.cells.get(self._cell(*pos), ()):
+            dist = math.dist(pos, center)
+            if dist < radius and dist < best_dist and (accept is None or accept(item)):
+                best, best_dist = item, dist
+        return best
+
+class Player:
+    def __init__(self, name, color, is_ai=False):
+        self.name, self.color, self.is_ai = name, color, is_ai
+        self.resources = dict.fromkeys(RESOURCES, 0)
+        self.roads_count = 0
+        self.settlements_count = 0
+        self.cities_count = 0
+        self.victory_points = 0
+        self.collected = 0  # Resources received from dice over the whole game
+        self.seat = None  # Index into CatanRules.players, set by start_draft
+        self.road_pieces = {}  # frozenset of connected road edge ids -> longest trail in it
+        self.longest_road = 0
+        self.agent = None  # Search player such as mcts.MCTSPlayer; None plays the greedy AI
+
+    def spend(self, cost):
+        for res, amt in cost.items(): self.resources[res] -= amt
+
+    def plan_trades(self, cost):
+        """4:1 bank trades that make `cost` affordable, as (give, get) pairs, or None if impossible."""
+        spare = {res: amt - cost.get(res, 0) for res, amt in self.resources.items()}
+        trades = []
+        for res, amt in cost.items():
+            while spare[res] < 0:
+                give = max(spare, key=spare.get)
+                if spare[give] < BANK_TRADE_RATE: return None
+                spare[give] -= BANK_TRADE_RATE
+                spare[res] += 1
+                trades.append((give, res))
+        return trades
+
+# Node, Edge and Tile hold only the fixed board topology. Who owns what lives
+# in CatanRules' owner arrays, indexed by these integer ids.
+class Node:
+    def __init__(self, id, pos):
+        self.id = id
+        self.pos = pos
+        self.touching_tiles = []
+        self.neighbors = []
+        self.edges = []
+
+class Edge:
+    def __init__(self, id, node_a, node_b):
+        self.id = id
+        self.nodes = (node_a, node_b)
+
+class Tile:
+    def __init__(self, id, pos):
+        self.id = id
+        self.pos = pos
+        self.resource = "Desert"
+        self.number = None
+
+def masked_argmax(values, mask):
+    """Index of the largest entry of `values` where `mask` is set (the first one on ties)."""
+    candidates = np.flatnonzero(mask)
+    return candidates[np.argmax(values[candidates])]
+
+class CatanRules:
+    """
+    Board, draft, AI and dice-distribution rules with no pygame dependency
+    and no frame or AI delays. CatanEngine layers rendering and input on top;
+    on its own this class runs whole games as fast as Python allows.
+    """
+
+    def __init__(self):
+        self.tiles, self.nodes, self.edges, self.players = [], [], [], []
+        self.phase = "SETUP_BOARD"
+        self.current_idx = 0
+        self.setup_step = 0
+        self.draft_order = [0, 1, 2, 2, 1, 0]
+        self.placed_settlement = False
+        self.road_mode = False
+        self.winner = None
+        self.longest_road_holder = None  # Seat holding the Longest Road card
+        self.log = None  # gamelog.GameLog recording this game's events, if any
+        self.payouts = {}  # dice roll -> [(node id, resource)] for every settled node on a tile with that number
+        self.status_msg = "SETUP: Left Click = Resource | Right Click = Number. Press ENTER to Draft."
+
+        self._init_world()
+
+    def _init_world(self):
+        start_x, start_y = (WIDTH - SIDEBAR_WIDTH) // 2, HEIGHT // 2
+        node_map = {}
+        edge_set = set()
+
+        for q, r in LAYOUT:
+            dx = HEX_SIZE * math.sqrt(3) * (q + r/2)
+            dy = HEX_SIZE * (3/2 * r)
+            center = (start_x + dx, start_y + dy)
+            t = Tile(len(self.tiles), center)
+            self.tiles.append(t)
+
+            hex_nodes = []
+            for i in range(6):
+                angle = math.radians(60 * i - 30)
+                nx, ny = center[0] + HEX_SIZE * math.cos(angle), center[1] + HEX_SIZE * math.sin(angle)
+                key = (round(nx, 1), round(ny, 1))
+                if key not in node_map: node_map[key] = Node(len(node_map), key)
+                node_map[key].touching_tiles.append(t)
+                hex_nodes.append(node_map[key])
+
+            for i in range(6):
+                n1, n2 = hex_nodes[i], hex_nodes[(i+1)%6]
+                if n2 not in n1.neighbors: n1.neighbors.append(n2)
+                if n1 not in n2.neighbors: n2.neighbors.append(n1)
+                pair = tuple(sorted([id(n1), id(n2)]))
+                if pair not in edge_set:
+                    e = Edge(len(self.edges), n1, n2)
+                    self.edges.append(e)
+                    n1.edges.append(e); n2.edges.append(e)
+                    edge_set.add(pair)
+        self.nodes = list(node_map.values())
+        self._build_graph()
+
+    # --- Hit-test index for clicks and hover, built on first use so headless games never pay for it ---
+    @functools.cached_property
+    def tile_grid(self):
+        grid = SpatialGrid()
+        for t in self.tiles: grid.insert(t, t.pos, TILE_HIT_RADIUS)
+        return grid
+
+    @functools.cached_property
+    def node_grid(self):
+        grid = SpatialGrid()
+        for n in self.nodes: grid.insert(n, n.pos, NODE_HIT_RADIUS)
+        return grid
+
+    @functools.cached_property
+    def edge_grid(self):
+        grid = SpatialGrid()
+        for e in self.edges:
+            mid = ((e.nodes[0].pos[0] + e.nodes[1].pos[0])/2, (e.nodes[0].pos[1] + e.nodes[1].pos[1])/2)
+            grid.insert(e, mid, EDGE_HIT_RADIUS)
+        return grid
+
+    def _build_graph(self):
+        """Static adjacency/incidence arrays plus the per-game owner arrays (-1 = unowned, else a seat)."""
+        n_nodes, n_edges = len(self.nodes), len(self.edges)
+        self.edge_nodes = np.array([(a.id, b.id) for a, b in (e.nodes for e in self.edges)], dtype=np.intp)
+        # Plain-int copies for the longest-road walks, which are too branchy to vectorize
+        self.edge_node_ids = [(a.id, b.id) for a, b in (e.nodes for e in self.edges)]
+        self.node_edge_ids = [[e.id for e in n.edges] for n in self.nodes]
+        self.node_adjacency = np.zeros((n_nodes, n_nodes), dtype=bool)
+        self.node_adjacency[self.edge_nodes[:, 0], self.edge_nodes[:, 1]] = True
+        self.node_adjacency[self.edge_nodes[:, 1], self.edge_nodes[:, 0]] = True
+        self.node_edge_incidence = np.zeros((n_nodes, n_edges), dtype=bool)
+        self.node_edge_incidence[self.edge_nodes[:, 0], np.arange(n_edges)] = True
+        self.node_edge_incidence[self.edge_nodes[:, 1], np.arange(n_edges)] = True
+        self.node_tile_incidence = np.zeros((n_nodes, len(self.tiles)), dtype=bool)
+        for n in self.nodes:
+            self.node_tile_incidence[n.id, [t.id for t in n.touching_tiles]] = True
+
+        self.node_values = np.zeros(n_nodes)  # Weighted pips per node, see refresh_tiles
+        self.node_owner = np.full(n_nodes, -1, dtype=np.int8)
+        self.node_city = np.zeros(n_nodes, dtype=bool)
+        self.edge_owner = np.full(n_edges, -1, dtype=np.int8)
+
+    def clone(self):
+        """
+        Independent copy of the game state for search. The board topology and
+        tiles are shared; owner arrays, players and the payout index are copied.
+        """
+        game = copy.copy(self)
+        game.log = None  # Searches on the copy must not write into this game's record
+        game.node_owner = self.node_owner.copy()
+        game.node_city = self.node_city.copy()
+        game.edge_owner = self.edge_owner.copy()
+        game.draft_order = list(self.draft_order)
+        game.payouts = {roll: list(entries) for roll, entries in self.payouts.items()}
+        game.players = []
+        for p in self.players:
+            clone = copy.copy(p)
+            clone.resources = dict(p.resources)
+            clone.road_pieces = dict(p.road_pieces)
+            game.players.append(clone)
+        game.winner = game.players[self.winner.seat] if self.winner else None
+        return game
+
+    # --- Ownership queries ---
+    def node_player(self, node):
+        seat = self.node_owner[node.id]
+        return self.players[seat] if seat >= 0 else None
+
+    def edge_player(self, edge):
+        seat = self.edge_owner[edge.id]
+        return self.players[seat] if seat >= 0 else None
+
+    def owned_nodes(self, p):
+        return [self.nodes[i] for i in np.flatnonzero(self.node_owner == p.seat)]
+
+    def state_key(self):
+        """Compact exact encoding of the game state, for transposition tables."""
+        holder = -1 if self.longest_road_holder is None else self.longest_road_holder
+        header = np.array([self.current_idx, self.setup_step, self.placed_settlement, holder], dtype=np.int16)
+        hands = np.array([[p.resources[res] for res in RESOURCES] for p in self.players], dtype=np.int16)
+        return b"".join((self.phase.encode(), header.tobytes(), self.node_owner.tobytes(),
+                         self.node_city.tobytes(), self.edge_owner.tobytes(), hands.tobytes()))
+
+    def open_nodes(self):
+        """Mask of empty nodes that satisfy the distance rule."""
+        occupied = self.node_owner >= 0
+        return ~occupied & ~self.node_adjacency[:, occupied].any(axis=1)
+
+    def road_nodes(self, p):
+        """Mask of nodes touched by one of p's roads."""
+        return self.node_edge_incidence[:, self.edge_owner == p.seat].any(axis=1)
+
+    def randomize_board(self, rng=random):
+        """Deal the standard tile and number distribution at random."""
+        resources = list(STANDARD_RESOURCES)
+        numbers = list(STANDARD_NUMBERS)
+        rng.shuffle(resources)
+        rng.shuffle(numbers)
+        for t, res in zip(self.tiles, resources):
+            t.resource = res
+            t.number = None if res == "Desert" else numbers.pop()
+        self.refresh_tiles()
+
+    def refresh_tiles(self):
+        """Recompute everything derived from tile resources and numbers, e.g. after tiles are edited."""
+        tile_values = np.array([self.get_dots(t.number) * RESOURCE_WEIGHTS.get(t.resource, 1.0) for t in self.tiles])
+        self.node_values = self.node_tile_incidence @ tile_values
+        self.rebuild_payouts()
+
+    def start_draft(self, players):
+        self.players = players
+        for seat, p in enumerate(players): p.seat = seat
+        if self.log is not None: self.log.start(self)
+        self.phase = "SETUP_PLACEMENTS"
+
+    def get_dots(self, num):
+        return DOTS.get(num, 0)
+
+    def node_scores(self):
+        """Settlement value of every node at once: its weighted pips, or 0 where the distance rule forbids it."""
+        return np.where(self.open_nodes(), self.node_values, 0.0)
+
+    def evaluate_node(self, node):
+        return self.node_scores()[node.id]
+
+    def node_production(self, node):
+        return self.node_values[node.id]
+
+    def award_points(self, p, points):
+        p.victory_points += points
+        if p.victory_points >= WINNING_POINTS and self.phase == "GAME_LOOP":
+            self.phase = "GAME_OVER"
+            self.winner = p
+            self.status_msg = f"{p.name} wins with {p.victory_points} points!"
+
+    def add_payouts(self, node):
+        for t in node.touching_tiles:
+            if t.number and t.resource != "Desert":
+                self.payouts.setdefault(t.number, []).append((node.id, t.resource))
+
+    def rebuild_payouts(self):
+        """Recompute the payout index from scratch."""
+        self.payouts = {}
+        for i in np.flatnonzero(self.node_owner >= 0):
+            self.add_payouts(self.nodes[i])
+
+    def place_settlement(self, node, p):
+        if self.log is not None: self.log.place("Settlement", p.seat, node.id)
+        self.node_owner[node.id] = p.seat
+        self.add_payouts(node)
+        p.settlements_count += 1
+        self.placed_settlement = True
+        self.award_points(p, 1)
+        self.break_roads(node, p)
+        # Grant resources on 2nd placement
+        if self.phase == "SETUP_PLACEMENTS" and self.setup_step >= len(self.draft_order) // 2:
+            for t in node.touching_tiles:
+                if t.resource != "Desert": p.resources[t.resource] += 1
+
+    def place_road(self, edge, p):
+        if self.log is not None: self.log.place("Road", p.seat, edge.id)
+        self.edge_owner[edge.id] = p.seat
+        p.roads_count += 1
+        self.extend_roads(edge, p)
+        if self.phase == "SETUP_PLACEMENTS": self.next_draft_step()
+
+    # --- Longest road ---
+    # Each player caches their roads as connected pieces with the longest trail
+    # through each. Placing a road only re-walks the piece it joins, and a
+    # settlement only re-splits opposing pieces that run through its node.
+    def _blocked(self, node_id, seat):
+        owner = self.node_owner[node_id]
+        return owner >= 0 and owner != seat
+
+    def _trail_length(self, piece, seat):
+        """Longest trail through the road edges in `piece`, never passing through an opponent's settlement."""
+        def walk(node_id, used):
+            if used and self._blocked(node_id, seat): return 0
+            best = 0
+            for e in self.node_edge_ids[node_id]:
+                if e in piece and e not in used:
+                    a, b = self.edge_node_ids[e]
+                    best = max(best, 1 + walk(b if a == node_id else a, used | {e}))
+            return best
+        return max(walk(n, frozenset()) for e in piece for n in self.edge_node_ids[e])
+
+    def _split_roads(self, edges, seat):
+        """Partition road edge ids into pieces connected through nodes that seat can pass."""
+        edges, pieces = set(edges), []
+        while edges:
+            stack = [edges.pop()]
+            piece = set(stack)
+            while stack:
+                for n in self.edge_node_ids[stack.pop()]:
+                    if self._blocked(n, seat): continue
+                    for e in self.node_edge_ids[n]:
+                        if e in edges:
+                            edges.remove(e); piece.add(e); stack.append(e)
+            pieces.append(frozenset(piece))
+        return pieces
+
+    def extend_roads(self, edge, p):
+        """Merge `edge` with the pieces of p's road it connects to and re-walk only the merged piece."""
+        ends = [n for n in self.edge_node_ids[edge.id] if not self._blocked(n, p.seat)]
+        joined = [piece for piece in p.road_pieces
+                  if any(e in piece for n in ends for e in self.node_edge_ids[n])]
+        merged = frozenset([edge.id]).union(*joined)
+        for piece in joined: del p.road_pieces[piece]
+        p.road_pieces[merged] = self._trail_length(merged, p.seat)
+        p.longest_road = max(p.road_pieces.values())
+        self.update_longest_road()
+
+    def break_roads(self, node, p):
+        """Re-split any opponent's road running through `node`, where p just settled."""
+        changed = False
+        for q in self.players:
+            if q is p: continue
+            for piece in [piece for piece in q.road_pieces if any(e in piece for e in self.node_edge_ids[node.id])]:
+                del q.road_pieces[piece]
+                for part in self._split_roads(piece, q.seat):
+                    q.road_pieces[part] = self._trail_length(part, q.seat)
+                q.longest_road = max(q.road_pieces.values())
+                changed = True
+        if changed: self.update_longest_road()
+
+    def update_longest_road(self):
+        """Move the Longest Road card (LONGEST_ROAD_POINTS VP) after road lengths change."""
+        lengths = [p.longest_road for p in self.players]
+        best = max(lengths)
+        holder = self.longest_road_holder
+        # The holder keeps the card on ties; a broken holder loses it to a sole leader, or to nobody
+        if holder is not None and lengths[holder] == best and best >= LONGEST_ROAD_MIN: return
+        leaders = [seat for seat, length in enumerate(lengths) if length == best]
+        new_holder = leaders[0] if best >= LONGEST_ROAD_MIN and len(leaders) == 1 else None
+        if new_holder == holder: return
+        self.longest_road_holder = new_holder
+        if holder is not None: self.award_points(self.players[holder], -LONGEST_ROAD_POINTS)
+        if new_holder is not None: self.award_points(self.players[new_holder], LONGEST_ROAD_POINTS)
+
+    def place_city(self, node, p):
+        if self.log is not None: self.log.place("City", p.seat, node.id)
+        self.node_city[node.id] = True
+        p.settlements_count -= 1
+        p.cities_count += 1
+        self.award_points(p, 1)
+
+    # --- Building during the game loop ---
+    def settlement_mask(self, p):
+        """Empty nodes that satisfy the distance rule and touch one of p's roads."""
+        return self.open_nodes() & self.road_nodes(p)
+
+    def road_mask(self, p):
+        """Empty edges connected to p's network, not passing through an opponent's settlement."""
+        # A road can extend from p's own settlements, or from an empty node one of p's roads reaches
+        reach = (self.node_owner == p.seat) | ((self.node_owner < 0) & self.road_nodes(p))
+        return (self.edge_owner < 0) & reach[self.edge_nodes].any(axis=1)
+
+    def settlement_spots(self, p):
+        return [self.nodes[i] for i in np.flatnonzero(self.settlement_mask(p))]
+
+    def road_spots(self, p):
+        return [self.edges[i] for i in np.flatnonzero(self.road_mask(p))]
+
+    def road_values(self, scores=None):
+        """Per-edge value of the best settlement reachable within one more road from either end."""
+        if scores is None: scores = self.node_scores()
+        reach = np.maximum(scores, 0.5 * (self.node_adjacency * scores).max(axis=1))
+        return reach[self.edge_nodes].max(axis=1)
+
+    def road_value(self, edge):
+        return self.road_values()[edge.id]
+
+    def pieces_left(self, p, piece):
+        built = {"Road": p.roads_count, "Settlement": p.settlements_count, "City": p.cities_count}[piece]
+        return PIECE_LIMITS[piece] - built
+
+    def can_afford(self, p, piece):
+        return self.pieces_left(p, piece) > 0 and p.plan_trades(COSTS[piece]) is not None
+
+    def try_buy(self, p, piece):
+        """Pay for `piece`, bank-trading 4:1 if needed. Returns False if p cannot afford it."""
+        if self.pieces_left(p, piece) <= 0: return False
+        trades = p.plan_trades(COSTS[piece])
+        if trades is None: return False
+        for give, get in trades:
+            if self.log is not None: self.log.trade(p.seat, give, get)
+            p.resources[give] -= BANK_TRADE_RATE
+            p.resources[get] += 1
+        p.spend(COSTS[piece])
+        return True
+
+    def ai_build(self, p):
+        """Greedy AI turn: cities first, then settlements, then roads toward open spots."""
+        while self.phase == "GAME_LOOP":
+            own = (self.node_owner == p.seat) & ~self.node_city
+            if own.any() and self.try_buy(p, "City"):
+                self.place_city(self.nodes[masked_argmax(self.node_values, own)], p)
+                continue
+            scores = self.node_scores()
+            spots = self.settlement_mask(p)
+            if spots.any():
+                if self.try_buy(p, "Settlement"):
+                    self.place_settlement(self.nodes[masked_argmax(scores, spots)], p)
+                    continue
+                return
+            roads = self.road_mask(p)
+            if roads.any() and self.try_buy(p, "Road"):
+                self.place_road(self.edges[masked_argmax(self.road_values(scores), roads)], p)
+                continue
+            return
+
+    # --- Explicit actions, for search players ---
+    def legal_actions(self, p, setup_width=None):
+        """
+        Moves open to p right now as (piece, id) pairs: the current draft
+        placement, or during p's turn any affordable build plus ("End", None).
+        `setup_width` keeps only the best-scoring draft settlement spots.
+        """
+        if self.phase == "SETUP_PLACEMENTS":
+            if not self.placed_settlement:
+                scores = self.node_scores()
+                spots = np.flatnonzero(self.open_nodes())
+                spots = spots[np.argsort(-scores[spots], kind="stable")][:setup_width]
+                return [("Settlement", int(i)) for i in spots]
+            node = self.nodes[np.flatnonzero((self.node_owner == p.seat) & ~self.road_nodes(p))[0]]
+            return [("Road", e.id) for e in node.edges if self.edge_owner[e.id] < 0]
+        if self.phase != "GAME_LOOP":
+            return []
+
+        actions = [("End", None)]
+        if self.can_afford(p, "City"):
+            actions += [("City", int(i)) for i in np.flatnonzero((self.node_owner == p.seat) & ~self.node_city)]
+        if self.can_afford(p, "Settlement"):
+            actions += [("Settlement", int(i)) for i in np.flatnonzero(self.settlement_mask(p))]
+        if self.can_afford(p, "Road"):
+            actions += [("Road", int(i)) for i in np.flatnonzero(self.road_mask(p))]
+        return actions
+
+    def apply_action(self, p, action):
+        """Play one action from legal_actions. Builds are paid for during the game and free in the draft."""
+        piece, i = action
+        if piece == "End":
+            self.end_turn()
+            return
+        if self.phase == "GAME_LOOP" and not self.try_buy(p, piece):
+            raise ValueError(f"{p.name} cannot afford a {piece}")
+        if piece == "Road": self.place_road(self.edges[i], p)
+        elif piece == "Settlement": self.place_settlement(self.nodes[i], p)
+        else: self.place_city(self.nodes[i], p)
+
+    def ai_move(self):
+        p = self.players[self.current_idx]
+        if self.phase == "SETUP_PLACEMENTS" and p.agent:
+            self.apply_action(p, p.agent.choose(self))
+        elif self.phase == "SETUP_PLACEMENTS":
+            if not self.placed_settlement:
+                best_node = self.nodes[int(np.argmax(self.node_scores()))]
+                self.place_settlement(best_node, p)
+                self.status_msg = f"{p.name} (AI) placed settlement."
+            else:
+                # Road strategy: connect to best neighboring node
+                node = self.nodes[np.flatnonzero((self.node_owner == p.seat) & ~self.road_nodes(p))[0]]
+                scores = self.node_scores()
+                best_edge = max(node.edges, key=lambda e: scores[e.nodes[1].id if e.nodes[0] == node else e.nodes[0].id])
+                self.place_road(best_edge, p)
+
+    def next_draft_step(self):
+        self.placed_settlement = False
+        self.setup_step += 1
+        if self.setup_step >= len(self.draft_order):
+            self.phase = "GAME_LOOP"; self.current_idx = 0
+            self.status_msg = "Game Started! Use keys 2-9 for Dice."
+        else:
+            self.current_idx = self.draft_order[self.setup_step]
+
+    def distribute(self, val):
+        for i, res in self.payouts.get(val, ()):
+            p = self.players[self.node_owner[i]]
+            amount = 2 if self.node_city[i] else 1
+            p.resources[res] += amount
+            p.collected += amount
+
+    def end_turn(self):
+        if self.phase == "GAME_OVER": return
+        if self.log is not None: self.log.end_turn()
+        self.current_idx = (self.current_idx + 1) % len(self.players)
+
+    def roll_dice(self, val):
+        if self.log is not None: self.log.roll(val)
+        p = self.players[self.current_idx]
+        self.distribute(val)
+        if p.agent:
+            p.agent.play_turn(self)  # Builds, then ends the turn with ("End", None)
+        else:
+            if p.is_ai: self.ai_build(p)
+            self.end_turn()
+        if self.phase == "GAME_OVER": return
+        self.status_msg = f"Dice: {val}. Next Turn: {self.players[self.current_idx].name}"
+
+    def run_setup(self):
+        """Play the whole snake draft. Every player must be an AI."""
+        while self.phase == "SETUP_PLACEMENTS":
+            self.ai_move()
+
+    def play_turns(self, turns, rng=random):
+        """Roll 2d6 for up to `turns` turns, stopping early once someone wins. Returns turns played."""
+        for turn in range(turns):
+            if self.phase != "GAME_LOOP": return turn
+            self.roll_dice(rng.randint(1, 6) + rng.randint(1, 6))
+        return turns
+
+
+def new_ai_game(rng=random, n_players=3, log=None):
+    """Random standard board with `n_players` AI players, ready for the draft. `log` records the game."""
+    game = CatanRules()
+    game.log = log
+    game.randomize_board(rng)
+    game.draft_order = list(range(n_players)) + list(range(n_players))[::-1]
+    game.start_draft([Player(f"AI {i+1}", PLAYER_COLORS[i], True) for i in range(n_players)])
+    return game
+
+
+def simulate_game(seed=None, turns=300, n_players=3):
+    """Random board, all-AI draft, then random dice rolls until someone wins or `turns` run out."""
+    rng = random.Random(seed)
+    game = new_ai_game(rng, n_players)
+    game.run_setup()
+    game.turns_played = game.play_turns(turns, rng)
+    return game
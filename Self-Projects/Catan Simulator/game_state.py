@@ -1,15 +1,19 @@
 from pydantic import BaseModel, Field
 from typing import List, Dict, Optional
 
+import numpy as np
+
+from catan_rules import RESOURCES
+
+DEV_CARDS = ("Unknown", "Knight", "VP", "Roads", "Plenty", "Monopoly")
+
 class Player(BaseModel):
     name: str
     is_ai: bool
-    resources: Dict[str, int] = {"Wood": 0, "Brick": 0, "Sheep": 0, "Wheat": 0, "Ore": 0}
+    resources: Dict[str, int] = Field(default_factory=lambda: dict.fromkeys(RESOURCES, 0))
     victory_points: int = 0
-    dev_cards: Dict[str, int] = {
-        "Unknown": 0, # For opponents
-        "Knight": 0, "VP": 0, "Roads": 0, "Plenty": 0, "Monopoly": 0
-    }
+    # "Unknown" counts opponents' cards we saw bought but not revealed
+    dev_cards: Dict[str, int] = Field(default_factory=lambda: dict.fromkeys(DEV_CARDS, 0))
 
 class HexTile(BaseModel):
     q: int
@@ -18,9 +22,12 @@ class HexTile(BaseModel):
     number: Optional[int] = None
 
 class GameState(BaseModel):
-    players: List[Player] = []
+    players: List[Player] = Field(default_factory=list)
     current_turn_index: int = 0
-    board_tiles: List[HexTile] = []
+    board_tiles: List[HexTile] = Field(default_factory=list)
+    draft_order: List[int] = Field(default_factory=list)
+    draft_turn: int = 0
+    phase: str = "SETUP_BOARD"
 
     def initialize_snake_draft(self):
         # For 4 players: [0, 1, 2, 3, 3, 2, 1, 0]
@@ -33,7 +40,7 @@ class GameState(BaseModel):
     def get_draft_player(self):
         player_index = self.draft_order[self.draft_turn]
         return self.players[player_index]
-    
+
     def add_player(self, name: str, is_ai: bool):
         self.players.append(Player(name=name, is_ai=is_ai))
 
@@ -41,4 +48,107 @@ class GameState(BaseModel):
         return self.players[self.current_turn_index]
 
     def next_turn(self):
-        self.current_turn_index = (self.current_turn_index + 1) % len(self.players)
\ No newline at end of file
+        self.current_turn_index = (self.current_turn_index + 1) % len(self.players)
+
+    def compact(self) -> "CompactState":
+        return CompactState.from_model(self)
+
+
+# --- Compact state for search and undo ---
+PHASES = ("SETUP_BOARD", "SETUP_PLAYERS", "SETUP_PLACEMENTS", "GAME_LOOP")
+TILE_RESOURCES = (None, "None", "Wood", "Brick", "Sheep", "Wheat", "Ore", "Desert")
+MAX_PLAYERS = 4
+
+# Offsets into CompactState.values
+TURN, DRAFT_TURN, PHASE, N_PLAYERS = range(4)
+DRAFT_ORDER = 4  # 2 * MAX_PLAYERS seats, -1 padded
+PLAYERS = DRAFT_ORDER + 2 * MAX_PLAYERS
+PLAYER_WIDTH = len(RESOURCES) + 1 + len(DEV_CARDS)  # resources, victory points, dev cards
+VICTORY_POINTS = len(RESOURCES)
+TILES = PLAYERS + MAX_PLAYERS * PLAYER_WIDTH  # (resource code, number or 0) per tile
+
+# One random 64-bit key per (slot, low byte of value); a state's hash XORs the keys of its slots
+ZOBRIST = np.random.default_rng(0x5EED).integers(0, 2**63, size=(TILES + 2 * 64, 256), dtype=np.uint64)
+
+
+class CompactState:
+    """
+    GameState flattened into one int16 array plus the immutable bits (names,
+    AI flags, tile coordinates). Snapshot and restore copy ~100 integers,
+    and every write through set() keeps a Zobrist hash current in O(1), so
+    search and undo can key transposition tables on `hash`.
+    """
+    __slots__ = ("names", "is_ai", "coords", "values", "hash")
+
+    def __init__(self, names, is_ai, coords, values):
+        self.names, self.is_ai, self.coords = names, is_ai, coords
+        self.values = values
+        self.hash = self.full_hash()
+
+    @classmethod
+    def from_model(cls, state: GameState):
+        if len(state.players) > MAX_PLAYERS:
+            raise ValueError(f"CompactState supports at most {MAX_PLAYERS} players")
+        values = np.zeros(TILES + 2 * len(state.board_tiles), dtype=np.int16)
+        values[[TURN, DRAFT_TURN, PHASE, N_PLAYERS]] = (state.current_turn_index, state.draft_turn,
+                                                         PHASES.index(state.phase), len(state.players))
+        values[DRAFT_ORDER:PLAYERS] = -1
+        values[DRAFT_ORDER:DRAFT_ORDER + len(state.draft_order)] = state.draft_order
+        for i, p in enumerate(state.players):
+            base = PLAYERS + i * PLAYER_WIDTH
+            values[base:base + VICTORY_POINTS] = [p.resources[res] for res in RESOURCES]
+            values[base + VICTORY_POINTS] = p.victory_points
+            values[base + VICTORY_POINTS + 1:base + PLAYER_WIDTH] = [p.dev_cards[card] for card in DEV_CARDS]
+        for i, t in enumerate(state.board_tiles):
+            values[TILES + 2 * i] = TILE_RESOURCES.index(t.resource)
+            values[TILES + 2 * i + 1] = t.number or 0
+        return cls(tuple(p.name for p in state.players), tuple(p.is_ai for p in state.players),
+                   tuple((t.q, t.r) for t in state.board_tiles), values)
+
+    def to_model(self) -> GameState:
+        v = self.values.tolist()
+        players = []
+        for i, (name, is_ai) in enumerate(zip(self.names, self.is_ai)):
+            base = PLAYERS + i * PLAYER_WIDTH
+            players.append(Player(
+                name=name, is_ai=is_ai,
+                resources=dict(zip(RESOURCES, v[base:base + VICTORY_POINTS])),
+                victory_points=v[base + VICTORY_POINTS],
+                dev_cards=dict(zip(DEV_CARDS, v[base + VICTORY_POINTS + 1:base + PLAYER_WIDTH]))))
+        tiles = [HexTile(q=q, r=r, resource=TILE_RESOURCES[v[TILES + 2 * i]], number=v[TILES + 2 * i + 1] or None)
+                 for i, (q, r) in enumerate(self.coords)]
+        draft_order = [seat for seat in v[DRAFT_ORDER:PLAYERS] if seat >= 0]
+        return GameState(players=players, current_turn_index=v[TURN], board_tiles=tiles, draft_order=draft_order,
+                         draft_turn=v[DRAFT_TURN], phase=PHASES[v[PHASE]])
+
+    def full_hash(self):
+        slots = np.arange(len(self.values))
+        return int(np.bitwise_xor.reduce(ZOBRIST[slots, self.values.astype(np.uint8)]))
+
+    def snapshot(self):
+        return self.values.copy(), self.hash
+
+    def restore(self, snapshot):
+        values, self.hash = snapshot
+        self.values[:] = values
+
+    def set(self, slot, value):
+        old = self.values[slot]
+        self.hash ^= int(ZOBRIST[slot, old & 0xFF] ^ ZOBRIST[slot, value & 0xFF])
+        self.values[slot] = value
+
+    # --- Named writes, all through set() ---
+    def player_slot(self, player, field):
+        """Slot of a resource, dev card or "victory_points" for player index `player`."""
+        base = PLAYERS + player * PLAYER_WIDTH
+        if field in RESOURCES: return base + RESOURCES.index(field)
+        if field in DEV_CARDS: return base + VICTORY_POINTS + 1 + DEV_CARDS.index(field)
+        if field == "victory_points": return base + VICTORY_POINTS
+        raise KeyError(field)
+
+    def add(self, player, field, amount):
+        slot = self.player_slot(player, field)
+        self.set(slot, int(self.values[slot]) + amount)
+
+    def next_turn(self):
+        self.set(TURN, (int(self.values[TURN]) + 1) % int(self.values[N_PLAYERS]))
@@ -0,0 +1,149 @@
+import os
+
+import numpy as np
+
+from catan_rules import BANK_TRADE_RATE, COSTS, PLAYER_COLORS, RESOURCES, CatanRules, Player
+
+MAGIC = b"CATANLOG"
+FORMAT_VERSION = 1
+
+# Every event is 4 bytes: kind, then up to three small integer arguments
+EVENT_DTYPE = np.dtype([("kind", "u1"), ("a", "u1"), ("b", "u1"), ("c", "u1")])
+TILE, START, SETTLEMENT, ROAD, CITY, ROLL, TRADE, DEV_CARD, END_TURN = range(1, 10)
+# TILE       tile id, resource code, number (0 = none)
+# START      players, AI seats as a bitmask
+# SETTLEMENT seat, node id      ROAD seat, edge id      CITY seat, node id
+# ROLL       dice total         TRADE seat, given resource code, received resource code
+# DEV_CARD   seat, card code (the rules have no development cards yet; replay skips these)
+# END_TURN   no arguments
+TILE_RESOURCES = ("Desert",) + RESOURCES
+DEV_CARDS = ("Unknown", "Knight", "VP", "Roads", "Plenty", "Monopoly")
+
+
+PIECE_EVENTS = {"Settlement": SETTLEMENT, "Road": ROAD, "City": CITY}
+
+
+class GameLog:
+    """
+    Append-only binary record of one game. Attach one to CatanRules.log
+    before start_draft and the rules append the board, every placement,
+    roll, bank trade and turn end as they happen; save() writes MAGIC, a
+    version byte and the raw 4-byte events.
+    """
+
+    def __init__(self, events=None):
+        self.buffer = bytearray() if events is None else bytearray(events.tobytes())
+
+    def record(self, kind, a=0, b=0, c=0):
+        self.buffer += bytes((kind, a, b, c))
+
+    def start(self, game):
+        for t in game.tiles:
+            self.record(TILE, t.id, TILE_RESOURCES.index(t.resource), t.number or 0)
+        self.record(START, len(game.players), sum(p.is_ai << seat for seat, p in enumerate(game.players)))
+
+    def place(self, piece, seat, target_id):
+        self.record(PIECE_EVENTS[piece], seat, target_id)
+
+    def roll(self, total):
+        self.record(ROLL, total)
+
+    def trade(self, seat, give, get):
+        self.record(TRADE, seat, TILE_RESOURCES.index(give), TILE_RESOURCES.index(get))
+
+    def dev_card(self, seat, card):
+        self.record(DEV_CARD, seat, DEV_CARDS.index(card))
+
+    def end_turn(self):
+        self.record(END_TURN)
+
+    @property
+    def events(self):
+        return np.frombuffer(bytes(self.buffer), dtype=EVENT_DTYPE)
+
+    def save(self, path):
+        with open(path, "wb") as file:
+            file.write(MAGIC + bytes((FORMAT_VERSION,)) + self.buffer)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as file:
+            data = file.read()
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a Catan game log")
+        if data[len(MAGIC)] != FORMAT_VERSION:
+            raise ValueError(f"{path} has log format {data[len(MAGIC)]}, expected {FORMAT_VERSION}")
+        return cls(np.frombuffer(data, dtype=EVENT_DTYPE, offset=len(MAGIC) + 1))
+
+
+def iter_logs(directory):
+    """Yield (path, GameLog) for every *.catanlog file in `directory`, for bulk offline analysis."""
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".catanlog"):
+            path = os.path.join(directory, name)
+            yield path, GameLog.load(path)
+
+
+class Replay:
+    """
+    Rebuilds the headless game state at any turn of a recorded game. Turn k
+    is the state just before the k-th dice roll; turn 0 is the end of the
+    draft. A clone of the state is kept every `snapshot_every` turns as
+    replay passes it, so a later seek replays at most that many turns.
+    """
+
+    def __init__(self, log, snapshot_every=10):
+        self.events = log.events
+        self.snapshot_every = snapshot_every
+        self.turn_starts = np.flatnonzero(self.events["kind"] == ROLL)
+        self.snapshots = {}  # turn -> CatanRules at that turn's ROLL event
+
+    @property
+    def turns(self):
+        return len(self.turn_starts)
+
+    def state_at(self, turn):
+        turn = min(turn, self.turns)
+        stop = self.turn_starts[turn] if turn < self.turns else len(self.events)
+
+        base = max((t for t in self.snapshots if t <= turn), default=None)
+        if base is None:
+            game, pos, next_turn = CatanRules(), 0, 0
+        else:
+            game, pos, next_turn = self.snapshots[base].clone(), self.turn_starts[base], base
+
+        for kind, a, b, c in self.events[pos:stop].tolist():
+            if kind == ROLL:
+                if next_turn % self.snapshot_every == 0 and next_turn not in self.snapshots:
+                    self.snapshots[next_turn] = game.clone()
+                next_turn += 1
+            self.apply(game, kind, a, b, c)
+        return game
+
+    def final_state(self):
+        return self.state_at(self.turns)
+
+    @staticmethod
+    def apply(game, kind, a, b, c):
+        if kind == TILE:
+            t = game.tiles[a]
+            t.resource, t.number = TILE_RESOURCES[b], c or None
+        elif kind == START:
+            seats = list(range(a))
+            game.draft_order = seats + seats[::-1]
+            game.refresh_tiles()
+            game.start_draft([Player(f"Player {i+1}", PLAYER_COLORS[i], bool(b >> i & 1)) for i in seats])
+        elif kind in (SETTLEMENT, ROAD, CITY):
+            p = game.players[a]
+            piece, place = {SETTLEMENT: ("Settlement", game.place_settlement), ROAD: ("Road", game.place_road),
+                            CITY: ("City", game.place_city)}[kind]
+            if game.phase == "GAME_LOOP": p.spend(COSTS[piece])
+            place((game.edges if kind == ROAD else game.nodes)[b], p)
+        elif kind == ROLL:
+            game.distribute(a)
+        elif kind == TRADE:
+            p = game.players[a]
+            p.resources[TILE_RESOURCES[b]] -= BANK_TRADE_RATE
+            p.resources[TILE_RESOURCES[c]] += 1
+        elif kind == END_TURN:
+            game.end_turn()
@@ -2,16 +2,54 @@ import pygame
 import sys
 from game_state import GameState
 from board import BoardRenderer
+from catan_rules import LAYOUT, PLAYER_COLORS, RESOURCE_WEIGHTS, CatanRules, Player
+from mcts import MCTSPlayer
 
 WIDTH, HEIGHT = 800, 600
+TEXT_RECT = pygame.Rect(0, 0, WIDTH, 44)
 
-def get_best_ai_move(state: GameState):
-    # Placeholder for the Optimization/Heuristic Algorithm
-    print("\n[AI ENGINE] Calculating best move...")
-    print("[AI ENGINE] Decision: Build Road at (x,y)")
+def build_headless_game(state: GameState):
+    """
+    Headless copy of the physical board for search. GameState tracks tiles and
+    hands but not yet placed pieces, so the copy starts at the current draft
+    player's opening placement on an empty board.
+    """
+    if len(state.players) > len(PLAYER_COLORS):
+        raise ValueError(f"The headless rules support at most {len(PLAYER_COLORS)} players")
+    game = CatanRules()
+    tiles = {(q, r): t for (q, r), t in zip(LAYOUT, game.tiles)}
+    for hex_tile in state.board_tiles:
+        t = tiles[(hex_tile.q, hex_tile.r)]
+        t.resource = hex_tile.resource if hex_tile.resource in RESOURCE_WEIGHTS else "Desert"
+        t.number = hex_tile.number
+    game.refresh_tiles()
+
+    seats = list(range(len(state.players)))
+    game.draft_order = seats + seats[::-1]
+    players = [Player(p.name, PLAYER_COLORS[i], True) for i, p in enumerate(state.players)]
+    for headless, p in zip(players, state.players):
+        headless.resources.update(p.resources)
+    game.start_draft(players)
+    game.setup_step = state.draft_turn
+    game.current_idx = state.draft_order[state.draft_turn]
+    return game
+
+def get_best_ai_move(state: GameState, time_limit=2.0):
+    """Search the AI's opening placement. Only valid during the draft: later turns would need the placed pieces."""
+    print("\n[AI ENGINE] Calculating best opening placement...")
+    game = build_headless_game(state)
+    agent = MCTSPlayer(time_limit=time_limit)
+    piece, i = agent.choose(game)
+    nodes = [game.nodes[i]] if piece != "Road" else [game.nodes[n] for n in game.edge_nodes[i]]
+    where = ", ".join(sorted({f"{t.resource} {t.number or '-'}" for n in nodes for t in n.touching_tiles}))
+    print(f"[AI ENGINE] Opening placement: {piece} touching {where}")
+    if state.draft_turn:
+        print("[AI ENGINE] (Earlier draft placements are not tracked yet, so this ignores them.)")
+    print(f"[AI ENGINE] {agent.stats['rollouts']} rollouts in {agent.stats['elapsed']:.1f}s "
+          f"({agent.rollouts_per_sec:.0f}/s), {len(agent.table)} states in the table")
     # If the AI decides to buy a dev card:
     # dev_card_override()
-    pass
+    return piece, i
 
 def dev_card_override(state: GameState, player_name: str):
     print(f"\n--- DEV CARD OVERRIDE ---")
@@ -31,11 +69,11 @@ def main():
     state.board_tiles = board.generate_layout(WIDTH // 2, HEIGHT // 2)
 
     phase = "SETUP_BOARD"
-    
+    font = pygame.font.SysFont(None, 24)
+    shown_text = None
+
     running = True
     while running:
-        screen.fill((30, 144, 255))
-        
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
@@ -43,12 +81,26 @@ def main():
             if phase == "SETUP_BOARD":
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     board.handle_click(event.pos, event.button)
+                if event.type == pygame.MOUSEMOTION:
+                    board.set_hover(event.pos)
                 if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
                     phase = "SETUP_PLAYERS"
+                    board.set_hover(None)
                     
             elif phase == "GAME_LOOP":
                 # In the game loop, pressing space triggers the terminal logic for the current turn
-                if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE and state.phase == "SETUP_PLACEMENTS":
+                    current = state.get_draft_player()
+                    print(f"\n--- {current.name}'s Opening Placement ---")
+                    if current.is_ai:
+                        get_best_ai_move(state)
+                    state.draft_turn += 1
+                    if state.draft_turn == len(state.draft_order):
+                        state.phase = "GAME_LOOP"
+                        print("Draft complete. The game has started.")
+                    print("Press SPACE in the Pygame window to process the next turn.")
+
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
                     current = state.get_current_player()
                     print(f"\n--- {current.name}'s Turn ---")
                     
@@ -59,36 +111,45 @@ def main():
                     else:
                         roll = input(f"What did YOU (AI) roll? (2-12): ")
                         print(f"Distributing resources for roll: {roll}")
-                        get_best_ai_move(state)
+                        # The search needs the placed pieces, which GameState does not track yet
+                        print("[AI ENGINE] No mid-game suggestion: placed pieces are not tracked yet.")
                         
                     state.next_turn()
                     print("Press SPACE in the Pygame window to process the next turn.")
 
-        board.draw()
-        
+        dirty = board.draw()
+
         # UI Text Instructions
-        font = pygame.font.SysFont(None, 24)
         if phase == "SETUP_BOARD":
-            text = font.render("Left Click: Cycle Resource | Right Click: Cycle Number | ENTER: Next", True, (255, 255, 255))
+            text = "Left Click: Cycle Resource | Right Click: Cycle Number | ENTER: Next"
         elif phase == "SETUP_PLAYERS":
-            text = font.render("Look at Terminal to setup players...", True, (255, 255, 255))
+            text = "Look at Terminal to setup players..."
         else:
-            text = font.render("GAME ACTIVE. Press SPACE to trigger the next turn.", True, (255, 255, 255))
-        screen.blit(text, (20, 20))
+            text = "GAME ACTIVE. Press SPACE to trigger the next turn."
+        if text != shown_text or TEXT_RECT.collidelist(dirty) != -1:
+            board.restore(TEXT_RECT)
+            screen.blit(font.render(text, True, (255, 255, 255)), (20, 20))
+            dirty.append(TEXT_RECT)
+            shown_text = text
 
-        pygame.display.flip()
+        # Only the changed regions go to the display; an idle frame pushes nothing
+        if dirty: pygame.display.update(dirty)
         
         # Intercept terminal logic smoothly without freezing Pygame
         if phase == "SETUP_PLAYERS":
             print("\n--- PLAYER SETUP ---")
-            num = int(input("Enter number of players (2-4): "))
+            num = 0
+            while not 2 <= num <= len(PLAYER_COLORS):
+                answer = input(f"Enter number of players (2-{len(PLAYER_COLORS)}): ")
+                num = int(answer) if answer.isdigit() else 0
             for i in range(num):
                 name = input(f"Enter name for Player {i+1} (In turn order): ")
                 is_ai = input(f"Is {name} the AI Engine? (y/n): ").lower() == 'y'
                 state.add_player(name, is_ai)
             
-            print("\nSetup Complete. The game has started.")
-            print("Press SPACE in the Pygame window to process the first turn.")
+            state.initialize_snake_draft()
+            print("\nSetup Complete. The opening draft has started.")
+            print("Press SPACE in the Pygame window to process the first placement.")
             phase = "GAME_LOOP"
 
         clock.tick(30)
@@ -0,0 +1,146 @@
+import math
+import random
+import time
+
+from catan_rules import WINNING_POINTS
+
+
+class _Entry:
+    """Transposition-table record for one state: visit statistics plus its expanded moves."""
+    __slots__ = ("visits", "value", "untried", "children")
+
+    def __init__(self, actions):
+        self.visits = 0
+        self.value = 0.0
+        self.untried = actions[::-1]  # pop() expands the first (best-ranked) action first
+        self.children = {}  # action -> state key
+
+
+class MCTSPlayer:
+    """
+    Monte Carlo Tree Search over one player's own decisions: a draft
+    placement, or the builds made between a dice roll and ("End", None).
+    Leaves are scored by rolling the rest of the game out on cloned headless
+    rules with the greedy AI for every seat and random dice.
+
+    Each decision searches until `time_limit` seconds or `rollouts` rollouts,
+    whichever runs out first, so playing strength scales with CPU time.
+    Statistics are stored per state in a transposition table keyed by
+    CatanRules.state_key(), which merges build orders that reach the same
+    position and carries results over between decisions in a turn.
+    """
+
+    def __init__(self, time_limit=1.0, rollouts=None, exploration=1.4, max_turns=200, setup_width=8,
+                 max_table=200_000, seed=None):
+        if time_limit is None and rollouts is None:
+            raise ValueError("MCTSPlayer needs a time_limit or a rollouts budget")
+        self.time_limit = time_limit
+        self.rollouts = rollouts
+        self.exploration = exploration
+        self.max_turns = max_turns  # Rollouts stopping here without a winner score by VP share
+        self.setup_width = setup_width
+        self.max_table = max_table
+        self.rng = random.Random(seed)
+        self.table = {}
+        self._phase = None  # Phase of the decision being searched
+        self.stats = {"decisions": 0, "rollouts": 0, "elapsed": 0.0}
+
+    @property
+    def rollouts_per_sec(self):
+        return self.stats["rollouts"] / self.stats["elapsed"] if self.stats["elapsed"] else 0.0
+
+    def play_turn(self, game):
+        """Build on the current player's turn until the search picks ("End", None)."""
+        p = game.players[game.current_idx]
+        while game.phase == "GAME_LOOP":
+            action = self.choose(game)
+            game.apply_action(p, action)
+            if action[0] == "End": return
+
+    def choose(self, game):
+        """Best action for the player to move in `game`, which is left untouched."""
+        seat = game.current_idx
+        actions = game.legal_actions(game.players[seat], self.setup_width)
+        if len(actions) <= 1:
+            return actions[0]
+        if len(self.table) > self.max_table:
+            self.table.clear()
+
+        self._phase = game.phase
+        root_key = game.state_key()
+        root = self.table.get(root_key)
+        if root is None:
+            root = self.table[root_key] = _Entry(actions)
+
+        start = time.perf_counter()
+        deadline = start + self.time_limit if self.time_limit is not None else math.inf
+        done = 0
+        while (self.rollouts is None or done < self.rollouts) and time.perf_counter() < deadline:
+            self._iterate(game, root, seat)
+            done += 1
+
+        self.stats["decisions"] += 1
+        self.stats["rollouts"] += done
+        self.stats["elapsed"] += time.perf_counter() - start
+        if not root.children:
+            return actions[0]
+        return max(root.children, key=lambda a: self.table[root.children[a]].visits)
+
+    def _iterate(self, game, root, seat):
+        state = game.clone()
+        p = state.players[seat]
+        path = [root]
+        entry = root
+        # Selection and expansion stop once the turn has passed to someone else
+        while self._to_move(state, seat):
+            if entry.untried:
+                action = entry.untried.pop()
+                state.apply_action(p, action)
+                key = state.state_key()
+                entry.children[action] = key
+                entry = self.table.get(key)
+                if entry is None:
+                    actions = state.legal_actions(p, self.setup_width) if self._to_move(state, seat) else []
+                    entry = self.table[key] = _Entry(actions)
+                path.append(entry)
+                break
+            if not entry.children:
+                break
+            action = self._select(entry)
+            state.apply_action(p, action)
+            entry = self.table[entry.children[action]]
+            path.append(entry)
+
+        reward = self._rollout(state, seat)
+        for e in path:
+            e.visits += 1
+            e.value += reward
+
+    def _select(self, entry):
+        log_visits = math.log(max(entry.visits, 1))
+
+        def ucb(action):
+            child = self.table[entry.children[action]]
+            if not child.visits: return math.inf
+            return child.value / child.visits + self.exploration * math.sqrt(log_visits / child.visits)
+        return max(entry.children, key=ucb)
+
+    def _to_move(self, state, seat):
+        # The draft can hand seat 0 straight into the game loop, before any roll: that is not this decision
+        return state.phase == self._phase and state.current_idx == seat
+
+    def _rollout(self, state, seat):
+        """Finish the game greedily from `state` (already a private clone). 1 = win, 0 = loss."""
+        for p in state.players:
+            p.is_ai, p.agent = True, None
+        if state.phase == "SETUP_PLACEMENTS":
+            state.run_setup()
+        elif state.phase == "GAME_LOOP" and self._to_move(state, seat):
+            # Mid-turn leaf: the greedy AI finishes this turn's builds
+            state.ai_build(state.players[seat])
+            state.end_turn()
+        state.play_turns(self.max_turns, self.rng)
+
+        points = [p.victory_points for p in state.players]
+        share = points[seat] / max(sum(points), WINNING_POINTS)
+        return 0.5 * share + (0.5 if state.winner is not None and state.winner.seat == seat else 0.0)
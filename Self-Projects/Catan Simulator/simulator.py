@@ -0,0 +1,136 @@
+import argparse
+import os
+import random
+import time
+from collections import defaultdict
+from multiprocessing import Pool
+
+from catan_rules import new_ai_game
+from gamelog import GameLog
+from mcts import MCTSPlayer
+
+
+def play_game(seed, n_players=3, max_turns=300, mcts_seat=None, mcts_rollouts=100, record_dir=None):
+    """
+    Play one all-AI game on the headless rules and return its summary. With
+    `mcts_seat` set, that seat searches `mcts_rollouts` rollouts per decision
+    instead of playing greedily. With `record_dir` set, the game's event log
+    is saved there for gamelog.Replay.
+    """
+    rng = random.Random(seed)
+    game = new_ai_game(rng, n_players, GameLog() if record_dir else None)
+    agent = None
+    if mcts_seat is not None:
+        agent = game.players[mcts_seat].agent = MCTSPlayer(time_limit=None, rollouts=mcts_rollouts, seed=seed)
+    game.run_setup()
+    # Production value of each player's two opening settlements, as evaluate_node scores it
+    opening = [sum(game.node_production(n) for n in game.owned_nodes(p)) for p in game.players]
+    turns = game.play_turns(max_turns, rng)
+    if record_dir:
+        game.log.save(os.path.join(record_dir, f"game_{seed:06d}.catanlog"))
+
+    return {
+        "winner": game.players.index(game.winner) if game.winner else None,
+        "turns": turns,
+        "opening_scores": opening,
+        "collected": [p.collected for p in game.players],
+        "victory_points": [p.victory_points for p in game.players],
+        "rollouts": agent.stats["rollouts"] if agent else 0,
+        "search_time": agent.stats["elapsed"] if agent else 0.0,
+    }
+
+
+def _play_chunk(args):
+    seeds, n_players, max_turns, mcts_seat, mcts_rollouts, record_dir = args
+    return [play_game(seed, n_players, max_turns, mcts_seat, mcts_rollouts, record_dir) for seed in seeds]
+
+
+def run_simulation(games, processes=None, seed=0, n_players=3, max_turns=300, chunksize=50, mcts_seat=None,
+                   mcts_rollouts=100, record_dir=None):
+    """Play `games` self-play games across a process pool and aggregate the results."""
+    seeds = list(range(seed, seed + games))
+    if mcts_seat is not None:
+        chunksize = 1  # Search games are slow, so spread them one at a time
+    if record_dir:
+        os.makedirs(record_dir, exist_ok=True)
+    chunks = [(seeds[i:i + chunksize], n_players, max_turns, mcts_seat, mcts_rollouts, record_dir)
+              for i in range(0, games, chunksize)]
+
+    start = time.perf_counter()
+    results = []
+    with Pool(processes or os.cpu_count()) as pool:
+        for chunk in pool.imap_unordered(_play_chunk, chunks):
+            results.extend(chunk)
+    return summarize(results, n_players, time.perf_counter() - start)
+
+
+def summarize(results, n_players, elapsed):
+    seat_wins = defaultdict(int)
+    rank_wins = defaultdict(int)
+    collected = [0] * n_players
+    total_turns = 0
+    decided = 0
+    rollouts = sum(r["rollouts"] for r in results)
+    search_time = sum(r["search_time"] for r in results)
+
+    for r in results:
+        total_turns += r["turns"]
+        for seat, amount in enumerate(r["collected"]):
+            collected[seat] += amount
+        if r["winner"] is None:
+            continue
+        decided += 1
+        seat_wins[r["winner"]] += 1
+        ranking = sorted(range(n_players), key=lambda s: -r["opening_scores"][s])
+        rank_wins[ranking.index(r["winner"]) + 1] += 1
+
+    return {
+        "games": len(results),
+        "games_per_sec": len(results) / elapsed if elapsed else float("inf"),
+        "undecided": len(results) - decided,
+        "mean_turns": total_turns / max(len(results), 1),
+        "seat_win_rate": {seat: seat_wins[seat] / max(decided, 1) for seat in range(n_players)},
+        "opening_rank_win_rate": {rank: rank_wins[rank] / max(decided, 1) for rank in range(1, n_players + 1)},
+        "resources_per_turn": {seat: collected[seat] / max(total_turns, 1) for seat in range(n_players)},
+        "rollouts": rollouts,
+        "rollouts_per_sec": rollouts / search_time if search_time else 0.0,
+    }
+
+
+def print_report(stats):
+    print(f"Games played:      {stats['games']}  ({stats['undecided']} hit the turn limit)")
+    print(f"Games/sec:         {stats['games_per_sec']:.1f}")
+    print(f"Mean turns/game:   {stats['mean_turns']:.1f}")
+    print("Win rate by draft seat:")
+    for seat, rate in stats["seat_win_rate"].items():
+        print(f"  seat {seat + 1}: {rate:.1%}")
+    print("Win rate by opening-placement score rank (1 = best evaluate_node total):")
+    for rank, rate in stats["opening_rank_win_rate"].items():
+        print(f"  rank {rank}: {rate:.1%}")
+    print("Resources collected per turn:")
+    for seat, rate in stats["resources_per_turn"].items():
+        print(f"  seat {seat + 1}: {rate:.2f}")
+    if stats["rollouts"]:
+        print(f"MCTS rollouts:     {stats['rollouts']}  ({stats['rollouts_per_sec']:.0f}/s per process)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo self-play on the headless Catan rules.")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--processes", type=int, default=0, help="Worker processes (0 = one per CPU)")
+    parser.add_argument("--players", type=int, default=3, choices=(2, 3, 4))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-turns", type=int, default=300)
+    parser.add_argument("--mcts-seat", type=int, default=None, help="Seat (1-based) played by the MCTS player")
+    parser.add_argument("--mcts-rollouts", type=int, default=100, help="MCTS rollouts per decision")
+    parser.add_argument("--record", metavar="DIR", default=None, help="Save every game's event log in DIR")
+    args = parser.parse_args()
+
+    mcts_seat = args.mcts_seat - 1 if args.mcts_seat else None
+    stats = run_simulation(args.games, args.processes or None, args.seed, args.players, args.max_turns,
+                           mcts_seat=mcts_seat, mcts_rollouts=args.mcts_rollouts, record_dir=args.record)
+    print_report(stats)
+
+
+if __name__ == "__main__":
+    main()
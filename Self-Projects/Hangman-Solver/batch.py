@@ -0,0 +1,114 @@
+import os
+import tempfile
+import time
+from collections import defaultdict
+from multiprocessing import Pool
+
+from main import HangmanSolver
+from word_index import WordIndex
+
+
+def reveal(word, letter):
+    """Simulated oracle: 1-based positions of `letter` in `word`, or [0] if absent."""
+    return [i + 1 for i, char in enumerate(word) if char == letter] or [0]
+
+
+def instrument(solver, timings):
+    """
+    Time get_best_letter on this solver instance. start_solve and
+    update_with_feedback call it internally, so play_word subtracts this
+    nested time to report each phase exclusively.
+    """
+    get_best_letter = solver.get_best_letter
+
+    def timed_get_best_letter():
+        start = time.perf_counter()
+        try:
+            return get_best_letter()
+        finally:
+            timings["get_best_letter"] += time.perf_counter() - start
+
+    solver.get_best_letter = timed_get_best_letter
+
+
+def play_word(solver, word, timings, max_misses=6):
+    """Play one game against the oracle. Returns (guesses, misses, solved)."""
+    guesses = misses = 0
+
+    nested = timings["get_best_letter"]
+    start = time.perf_counter()
+    next_letter = solver.start_solve(len(word))
+    timings["start_solve"] += time.perf_counter() - start - (timings["get_best_letter"] - nested)
+
+    while next_letter is not None and len(next_letter) == 1:
+        positions = reveal(word, next_letter)
+        guesses += 1
+        misses += positions == [0]
+
+        nested = timings["get_best_letter"]
+        start = time.perf_counter()
+        next_letter = solver.update_with_feedback(next_letter, positions)
+        timings["update"] += time.perf_counter() - start - (timings["get_best_letter"] - nested)
+
+    solved = ''.join(solver.current_pattern) == word and misses <= max_misses
+    return guesses, misses, solved
+
+
+# --- Worker process state, set once per worker by _init_worker ---
+_worker = {}
+
+
+def _init_worker(index_path, strategy, max_misses):
+    timings = defaultdict(float)
+    start = time.perf_counter()
+    solver = HangmanSolver(strategy=strategy, index=WordIndex.load(index_path))
+    timings["load"] += time.perf_counter() - start
+
+    instrument(solver, timings)
+    _worker.update(solver=solver, timings=timings, max_misses=max_misses)
+
+
+def _solve_chunk(words):
+    timings = _worker["timings"]
+    results = [play_word(_worker["solver"], word, timings, _worker["max_misses"]) for word in words]
+    chunk_timings = dict(timings)
+    timings.clear()
+    return results, chunk_timings
+
+
+def solve_batch(words, index, strategy="frequency", processes=None, max_misses=6, chunksize=256):
+    """
+    Play every word in `words` and return (results, timings), with results in
+    input order as (guesses, misses, solved) tuples and timings summed over
+    all workers.
+
+    With more than one process the index is shared read-only: workers
+    memory-map its compiled file rather than receiving a pickled copy or
+    re-reading the dictionary.
+    """
+    processes = processes or os.cpu_count()
+    if processes == 1:
+        timings = defaultdict(float)
+        solver = HangmanSolver(strategy=strategy, index=index)
+        instrument(solver, timings)
+        return [play_word(solver, word, timings, max_misses) for word in words], timings
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        index_path = index.path
+        if index_path is None:
+            index_path = os.path.join(tmp_dir, "index.bin")
+            index.save(index_path)
+
+        # Build the opening books here, once; workers then only read the book file
+        book = HangmanSolver(strategy=strategy, index=index).opening_book
+        if book is not None and book.path is not None:
+            book.prebuild(sorted({len(word) for word in words}))
+
+        chunks = [words[i:i + chunksize] for i in range(0, len(words), chunksize)]
+        results, timings = [], defaultdict(float)
+        with Pool(processes, initializer=_init_worker, initargs=(index_path, strategy, max_misses)) as pool:
+            for chunk_results, chunk_timings in pool.imap(_solve_chunk, chunks):
+                results.extend(chunk_results)
+                for phase, elapsed in chunk_timings.items():
+                    timings[phase] += elapsed
+    return results, timings
@@ -0,0 +1,70 @@
+import argparse
+import random
+import time
+
+import numpy as np
+
+from batch import solve_batch
+from main import STRATEGIES, HangmanSolver
+
+PHASES = ("load", "start_solve", "update", "get_best_letter")
+
+
+def summarize(results, timings, elapsed):
+    guesses = np.array([g for g, _, _ in results])
+    solved = np.array([s for _, _, s in results])
+    return {
+        "words": len(results),
+        "words_per_sec": len(results) / elapsed if elapsed else float("inf"),
+        "mean_guesses": guesses.mean(),
+        "p99_guesses": np.percentile(guesses, 99),
+        "failure_rate": 1 - solved.mean(),
+        "timings": dict(timings),
+    }
+
+
+def run_benchmark(dictionary_path="words_alpha.txt", strategy="frequency", sample=None, seed=0, max_misses=6,
+                  processes=1):
+    start = time.perf_counter()
+    index = HangmanSolver(dictionary_path, strategy).index
+    load_time = time.perf_counter() - start
+
+    words = index.words()
+    if sample:
+        words = random.Random(seed).sample(words, min(sample, len(words)))
+
+    start = time.perf_counter()
+    results, timings = solve_batch(words, index, strategy, processes, max_misses)
+    timings["load"] += load_time
+    return summarize(results, timings, time.perf_counter() - start)
+
+
+def print_report(stats):
+    print(f"Words played:   {stats['words']}")
+    print(f"Words/sec:      {stats['words_per_sec']:.1f}")
+    print(f"Mean guesses:   {stats['mean_guesses']:.2f}")
+    print(f"p99 guesses:    {stats['p99_guesses']:.0f}")
+    print(f"Failure rate:   {stats['failure_rate']:.2%}")
+    print("Time per phase:")
+    for phase in PHASES:
+        total = stats["timings"].get(phase, 0.0)
+        print(f"  {phase:<16} {total:8.3f}s  ({total / max(stats['words'], 1) * 1e3:.3f} ms/word)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play HangmanSolver against every dictionary word.")
+    parser.add_argument("--dictionary", default="words_alpha.txt")
+    parser.add_argument("--strategy", choices=STRATEGIES, default="frequency")
+    parser.add_argument("--sample", type=int, default=None, help="Play a random subset of this many words")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-misses", type=int, default=6, help="Wrong guesses allowed before a game counts as lost")
+    parser.add_argument("--processes", type=int, default=1, help="Worker processes (0 = one per CPU)")
+    args = parser.parse_args()
+
+    stats = run_benchmark(args.dictionary, args.strategy, args.sample, args.seed, args.max_misses,
+                          args.processes or None)
+    print_report(stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,64 +1,77 @@
 import re
-from collections import Counter
 import os
+import numpy as np
+from opening_book import OpeningBook
+from word_index import ALPHABET, WordIndex, letter_code, load_or_compile
 
 abspath = os.path.abspath(__file__)
 dname = os.path.dirname(abspath)
 os.chdir(dname)
 
 
+STRATEGIES = ("frequency", "entropy")
+
+
 class HangmanSolver:
-    def __init__(self, dictionary_path="words_alpha.txt"):
-        self.load_dictionary(dictionary_path)
+    def __init__(self, dictionary_path="words_alpha.txt", strategy="frequency", index=None,
+                 use_opening_book=True):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy {strategy!r}, expected one of {STRATEGIES}")
+        self.strategy = strategy
+        if index is None:
+            self.load_dictionary(dictionary_path)
+        else:
+            self.index = index  # Prebuilt (possibly memory-mapped) index shared between solvers
         self.word_length = 0
         self.current_pattern = []
-        self.possible_words = []
+        self.bucket = None
+        self.candidates = None  # Bitset over self.bucket of words still possible
+        self._possible_words = None
         self.guessed_letters = set()
-        self.match_found = False  # Switch from optimal order to frequency analysis
-
-        # Optimal guessing order by word length
-        self.optimal_order_map = {
-            1: list("AI"),
-            2: list("AOEIUMBH"),
-            3: list("AEOIUYHBCK"),
-            4: list("AEOIUYSBF"),
-            5: list("SEAOIUYH"),
-            6: list("EAIOUSY"),
-            7: list("EIAOUS"),
-            8: list("EIAOU"),
-            9: list("EIAOU"),
-            10: list("EIOAU"),
-            11: list("EIOAD"),
-            12: list("EIOAF"),
-            13: list("IEOA"),
-            14: list("IEO"),
-            15: list("IEA"),
-            16: list("IEH"),
-            17: list("IER"),
-            18: list("IEA"),
-            19: list("IEA"),
-            20: list("IE")
-        }
-        self.optimal_queue = []
+
+        # Precomputed early guesses per word length, replacing a hand-tuned opening order
+        self.opening_book = None
+        self.book_node = None
+        if use_opening_book:
+            if strategy not in self.index.opening_books:
+                self.index.opening_books[strategy] = OpeningBook(self.index, strategy, self.choose_letter)
+            self.opening_book = self.index.opening_books[strategy]
 
     def load_dictionary(self, dictionary_path):
         try:
-            with open(dictionary_path, 'r') as file:
-                self.dictionary = [word.strip().upper() for word in file.readlines()]
+            self.index = load_or_compile(dictionary_path)
         except FileNotFoundError:
             print(f"Dictionary file {dictionary_path} not found. Using a default dictionary.")
-            self.dictionary = ["HANGMAN", "PYTHON", "DICTIONARY", "SOLVER", "GAME", 
-                               "COMPUTER", "PROGRAMMING", "ALGORITHM", "CHALLENGE"]
+            self.index = WordIndex(["HANGMAN", "PYTHON", "DICTIONARY", "SOLVER", "GAME", 
+                                    "COMPUTER", "PROGRAMMING", "ALGORITHM", "CHALLENGE"])
+
+    @property
+    def dictionary(self):
+        # Decoded on demand so solvers sharing an index don't each hold every word as a string
+        return self.index.words()
+
+    @property
+    def possible_words(self):
+        if self.bucket is None:
+            return []
+        if self._possible_words is None:
+            self._possible_words = self.bucket.words(self.candidates)
+        return self._possible_words
+
+    @property
+    def possible_words_count(self):
+        return self.bucket.count(self.candidates) if self.bucket is not None else 0
 
     def start_solve(self, word_length):
         self.word_length = word_length
         self.current_pattern = ['_'] * word_length
-        self.possible_words = [word for word in self.dictionary if len(word) == word_length]
+        self.bucket = self.index.bucket(word_length)
+        self.candidates = self.bucket.full
+        self._possible_words = None
         self.guessed_letters = set()
-        self.match_found = False
-        self.optimal_queue = self.optimal_order_map.get(word_length, list("ETAOINSHRDLU"))  # fallback
-        
-        if not self.possible_words:
+        self.book_node = self.opening_book.root(word_length) if self.opening_book else None
+
+        if not self.possible_words_count:
             print(f"No {word_length}-letter words found in the dictionary.")
             return None
 
@@ -68,71 +81,83 @@ class HangmanSolver:
         self.guessed_letters.add(letter)
 
         if positions == [0]:  # Letter not in word
-            self.possible_words = [word for word in self.possible_words if letter not in word]
+            self.candidates = self.bucket.apply_feedback(self.candidates, letter, [], [])
         else:
-            self.match_found = True
             for pos in positions:
                 self.current_pattern[pos-1] = letter
 
-            new_possible_words = []
-            for word in self.possible_words:
-                match = True
-
-                for pos in positions:
-                    if word[pos-1] != letter:
-                        match = False
-                        break
-
-                if match:
-                    for i in range(self.word_length):
-                        if self.current_pattern[i] == '_' and i+1 not in positions and word[i] == letter:
-                            match = False
-                            break
+            hits = [pos-1 for pos in positions]
+            unknown = [i for i, char in enumerate(self.current_pattern) if char == '_']
+            self.candidates = self.bucket.apply_feedback(self.candidates, letter, hits, unknown)
 
-                if match:
-                    for i in range(self.word_length):
-                        if self.current_pattern[i] != '_' and word[i] != self.current_pattern[i]:
-                            match = False
-                            break
+        self._possible_words = None
 
-                if match:
-                    new_possible_words.append(word)
-
-            self.possible_words = new_possible_words
+        # Follow the opening book while our guesses are the ones it recommended
+        node, self.book_node = self.book_node, None
+        if node is not None and node["letter"] == letter:
+            self.book_node = node["children"].get(''.join(self.current_pattern))
 
         return self.get_best_letter()
 
     def get_best_letter(self):
-        if not self.possible_words:
+        if not self.possible_words_count:
             return "No matching words found in dictionary."
 
         if '_' not in self.current_pattern:
             return "Word solved: " + ''.join(self.current_pattern)
 
-        if not self.match_found:
-            while self.optimal_queue:
-                next_letter = self.optimal_queue.pop(0)
-                if next_letter not in self.guessed_letters:
-                    return next_letter
+        if self.book_node is not None:
+            return self.book_node["letter"]
+
+        return self.choose_letter(self.bucket, self.candidates, self.guessed_letters, ''.join(self.current_pattern))
 
-        # Frequency analysis
-        letter_counts = Counter()
-        for word in self.possible_words:
-            for char in set(word):
-                if char not in self.guessed_letters:
-                    letter_counts[char] += 1
+    def choose_letter(self, bucket, bits, guessed, pattern):
+        """Pick the next guess for the words in `bits` according to self.strategy."""
+        if self.strategy == "entropy":
+            return self.get_most_informative_letter(bucket, bits, guessed, pattern)
+        return self.get_most_frequent_letter(bucket, bits, guessed)
 
-        if not letter_counts:
+    def get_most_frequent_letter(self, bucket, bits, guessed):
+        # Frequency analysis: how many candidate words contain each letter
+        letter_counts = bucket.letter_counts(bits)
+        for letter in guessed:
+            letter_counts[letter_code(letter)] = 0
+
+        if not letter_counts.any():
             return "No more valid letters to guess."
 
-        best_letter = letter_counts.most_common(1)[0][0]
+        best_letter = ALPHABET[int(letter_counts.argmax())]
         return best_letter
 
+    def get_most_informative_letter(self, bucket, bits, guessed, pattern):
+        key = (len(pattern), frozenset(guessed), pattern)
+        best_letter = self.index.partition_cache.get(key)
+        if best_letter is not None:
+            return best_letter
+
+        letter_counts = bucket.letter_counts(bits)
+        for letter in guessed:
+            letter_counts[letter_code(letter)] = 0
+
+        if not letter_counts.any():
+            return "No more valid letters to guess."
+
+        # Highest expected information gain; ties go to the letter most likely to hit
+        entropy = bucket.reveal_entropy(bits)
+        entropy[letter_counts == 0] = -1
+        best_letter = ALPHABET[int(np.lexsort((letter_counts, entropy))[-1])]
+        self.index.partition_cache[key] = best_letter
+        return best_letter
+
+    def query(self, pattern, excluded=(), exclusive=True):
+        """Dictionary words matching e.g. "_A__E_" without any `excluded` letters."""
+        return self.index.query(pattern, excluded, exclusive)
+
     def get_status(self):
         return {
             'pattern': ''.join(self.current_pattern),
-            'possible_words_count': len(self.possible_words),
-            'possible_words': self.possible_words[:10] if len(self.possible_words) <= 10 else []
+            'possible_words_count': self.possible_words_count,
+            'possible_words': self.possible_words if self.possible_words_count <= 10 else []
         }
 
 def main():
@@ -143,7 +168,11 @@ def main():
     if not dict_path:
         dict_path = "words_alpha.txt"
 
-    solver = HangmanSolver(dict_path)
+    strategy = input("Enter guessing strategy (frequency/entropy, or press Enter for frequency): ").strip().lower()
+    if not strategy:
+        strategy = "frequency"
+
+    solver = HangmanSolver(dict_path, strategy)
     word_length = int(input("Enter the length of the word: "))
 
     next_letter = solver.start_solve(word_length)
@@ -0,0 +1,122 @@
+import json
+import os
+
+import numpy as np
+
+from word_index import LRUCache, letter_code
+
+_MISSING = object()
+
+
+class OpeningBook:
+    """
+    Decision tree of the first `depth` guesses for each word length under one
+    strategy. Every node is {"letter": guess, "children": {pattern: node}},
+    with a child for each reveal pattern that still leaves at least
+    `min_candidates` words, so the early turns with the largest candidate sets
+    become lookups instead of scoring passes.
+
+    Trees are kept in an in-memory LRU and, when the index was compiled from a
+    dictionary file, persisted to <dictionary>.<strategy>.book.json.
+    """
+
+    def __init__(self, index, strategy, choose_letter, depth=4, min_candidates=100, cache_size=32):
+        self.index = index
+        self.strategy = strategy
+        self.choose_letter = choose_letter  # (bucket, bits, guessed, pattern) -> letter
+        self.depth = depth
+        self.min_candidates = min_candidates
+        self.trees = LRUCache(cache_size)
+
+        self.path = None
+        if index.path is not None and index.fingerprint is not None:
+            self.path = f"{os.path.splitext(index.path)[0]}.{strategy}.book.json"
+
+    def root(self, length):
+        tree = self.trees.get(length, _MISSING)
+        if tree is _MISSING:
+            tree = self._read_trees().get(str(length), _MISSING)
+            if tree is _MISSING:
+                tree = self.build(length)
+                self._write_tree(length, tree)
+            self.trees[length] = tree
+        return tree
+
+    def prebuild(self, lengths):
+        """
+        Load or build the trees for every length in `lengths`, persisting the
+        new ones in a single write. solve_batch calls this before starting its
+        workers so they only read the book file, instead of each building the
+        same trees and rewriting the file over one another.
+        """
+        trees = self._read_trees()
+        missing = [length for length in lengths if str(length) not in trees]
+        for length in missing:
+            trees[str(length)] = self.build(length)
+        if missing and self.path is not None:
+            self._save(trees)
+        for length in lengths:
+            self.trees[length] = trees[str(length)]
+
+    def build(self, length):
+        bucket = self.index.bucket(length)
+        if not bucket.size:
+            return None
+        weights = np.left_shift(1, np.arange(length, dtype=np.int64))
+
+        def expand(bits, guessed, pattern, depth):
+            letter = self.choose_letter(bucket, bits, guessed, pattern)
+            if len(letter) != 1:
+                return None
+            node = {"letter": letter, "children": {}}
+            if depth == 1:
+                return node
+
+            # Split the candidates by where `letter` would be revealed
+            codes = bucket.codes[bucket.indices(bits)]
+            reveals, counts = np.unique((codes == letter_code(letter)) @ weights, return_counts=True)
+            for reveal, count in zip(reveals.tolist(), counts.tolist()):
+                if count < self.min_candidates:
+                    continue
+                hits = [i for i in range(length) if reveal >> i & 1]
+                child_pattern = ''.join(letter if i in hits else char for i, char in enumerate(pattern))
+                if '_' not in child_pattern:
+                    continue
+                unknown = [i for i, char in enumerate(child_pattern) if char == '_']
+                child_bits = bucket.apply_feedback(bits, letter, hits, unknown)
+                child = expand(child_bits, guessed | {letter}, child_pattern, depth - 1)
+                if child is not None:
+                    node["children"][child_pattern] = child
+            return node
+
+        return expand(bucket.full, frozenset(), '_' * length, self.depth)
+
+    def _settings(self):
+        return {"fingerprint": self.index.fingerprint, "strategy": self.strategy,
+                "depth": self.depth, "min_candidates": self.min_candidates}
+
+    def _read_trees(self):
+        if self.path is None:
+            return {}
+        try:
+            with open(self.path, "r") as file:
+                book = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        return book["trees"] if book.get("settings") == self._settings() else {}
+
+    def _write_tree(self, length, tree):
+        if self.path is None:
+            return
+        trees = self._read_trees()
+        trees[str(length)] = tree
+        self._save(trees)
+
+    def _save(self, trees):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w") as file:
+                json.dump({"settings": self._settings(), "trees": trees}, file)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass  # Read-only location, the in-memory LRU still applies
@@ -0,0 +1,301 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict, defaultdict
+
+import numpy as np
+
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+BLANKS = "_?."  # Unknown-letter markers accepted in query patterns
+
+# Compiled index file: MAGIC, 8-byte header length, JSON header, padding, data
+MAGIC = b"HANGMAN-INDEX\n"
+FORMAT_VERSION = 1
+_DATA_ALIGN = 64
+
+# Number of set bits in every possible byte, used to count packed bitsets
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def letter_code(letter):
+    return ord(letter) - ord("A")
+
+
+class LRUCache:
+    """Small least-recently-used mapping for memoizing per-state results."""
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        if key not in self._data:
+            return default
+        self._data.move_to_end(key)
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class LengthBucket:
+    """
+    All dictionary words of one length, stored as a (words x positions) uint8
+    matrix of letter codes, plus precomputed bitsets:
+
+      position_bits[p, c]  -> words with letter c at position p
+      present_bits[c]      -> words containing letter c anywhere
+
+    Bitsets are packed little-endian uint8 arrays where bit i is word i,
+    so filtering candidates is a handful of bitwise AND / AND-NOT ops.
+    """
+
+    def __init__(self, codes, position_bits=None, present_bits=None):
+        self.codes = codes
+        self.size, self.length = codes.shape
+
+        if position_bits is None:
+            onehot = codes[:, :, None] == np.arange(len(ALPHABET), dtype=np.uint8)
+            position_bits = np.packbits(onehot.transpose(1, 2, 0), axis=-1, bitorder="little")
+            present_bits = np.bitwise_or.reduce(position_bits, axis=0)
+        self.position_bits = position_bits
+        self.present_bits = present_bits
+        self.full = np.packbits(np.ones(self.size, dtype=bool), bitorder="little")
+
+    @classmethod
+    def from_words(cls, words, length):
+        codes = np.frombuffer("".join(words).encode("ascii"), dtype=np.uint8)
+        return cls(codes.reshape(len(words), length) - ord("A"))
+
+    @staticmethod
+    def shapes(size, length):
+        nbytes = (size + 7) // 8
+        return [(size, length), (length, len(ALPHABET), nbytes), (len(ALPHABET), nbytes)]
+
+    @classmethod
+    def from_buffer(cls, data, offset, size, length):
+        """Build a bucket whose arrays are views into the flat uint8 array `data`."""
+        arrays = []
+        for shape in cls.shapes(size, length):
+            count = int(np.prod(shape))
+            arrays.append(data[offset:offset + count].reshape(shape))
+            offset += count
+        return cls(*arrays)
+
+    def arrays(self):
+        return self.codes, self.position_bits, self.present_bits
+
+    def apply_feedback(self, bits, letter, hits, unknown):
+        """Keep words with `letter` at every index in `hits` and at no index in `unknown`."""
+        code = letter_code(letter)
+        if not hits:
+            return bits & ~self.present_bits[code]
+
+        bits = bits.copy()
+        for i in hits:
+            bits &= self.position_bits[i, code]
+        for i in unknown:
+            bits &= ~self.position_bits[i, code]
+        return bits
+
+    def count(self, bits):
+        return int(_POPCOUNT[bits].sum())
+
+    def letter_counts(self, bits):
+        """Number of words in `bits` containing each letter, as a length-26 array."""
+        return _POPCOUNT[self.present_bits & bits].sum(axis=1, dtype=np.int64)
+
+    def reveal_entropy(self, bits):
+        """
+        Shannon entropy (in bits) of the reveal pattern each letter would
+        produce over the words in `bits`, as a length-26 array. Guessing the
+        letter with the highest entropy gives the largest expected information
+        gain, i.e. the most even split of the remaining candidates.
+        """
+        codes = self.codes[self.indices(bits)]
+        entropy = np.zeros(len(ALPHABET))
+        if not len(codes):
+            return entropy
+
+        weights = np.left_shift(1, np.arange(self.length, dtype=np.int64))
+        for code in np.unique(codes):
+            patterns = (codes == code) @ weights
+            _, counts = np.unique(patterns, return_counts=True)
+            p = counts / len(codes)
+            entropy[code] = -(p * np.log2(p)).sum()
+        return entropy
+
+    def indices(self, bits):
+        return np.flatnonzero(np.unpackbits(bits, count=self.size, bitorder="little"))
+
+    def words(self, bits):
+        if not self.length:
+            return []  # No zero-length words are indexed
+        flat = (self.codes[self.indices(bits)] + ord("A")).tobytes().decode("ascii")
+        return [flat[i:i + self.length] for i in range(0, len(flat), self.length)]
+
+
+class WordIndex:
+    """
+    Length-bucketed bitset index over a dictionary, built once and shared by
+    every solve. Only plain A-Z words are indexed. Buckets are built lazily
+    the first time a word length is requested.
+    """
+
+    def __init__(self, words):
+        self._pending = defaultdict(list)
+        for word in words:
+            if word.isascii() and word.isalpha():
+                self._pending[len(word)].append(word)
+        self.buckets = {}
+        # Best entropy guess keyed on (length, guessed letters, pattern)
+        self.partition_cache = LRUCache()
+
+        self.opening_books = {}  # strategy -> OpeningBook
+        self.path = None  # Set when the index is memory-mapped from a compiled file
+        self.fingerprint = None  # SHA-256 of the source word list, when known
+
+    def bucket(self, length):
+        if length not in self.buckets:
+            words = self._pending.pop(length, [])
+            self.buckets[length] = LengthBucket.from_words(words, length)
+        return self.buckets[length]
+
+    def query(self, pattern, excluded=(), exclusive=True):
+        """
+        Words matching a partial pattern such as "_A__E_", where "_" (or "?" /
+        ".") is an unknown letter, containing none of the `excluded` letters.
+
+        With `exclusive` (Hangman rules) a letter shown in the pattern is fully
+        revealed, so it cannot also fill a blank. Pass exclusive=False for
+        crossword-style lookups where blanks may be any letter.
+        """
+        pattern = pattern.upper()
+        excluded = {letter.upper() for letter in excluded}
+        for char in set(pattern) | excluded:
+            if char not in ALPHABET and char not in BLANKS:
+                raise ValueError(f"Unsupported character {char!r} in query")
+
+        bucket = self.bucket(len(pattern))
+        bits = bucket.full
+        unknown = [i for i, char in enumerate(pattern) if char in BLANKS]
+        for letter in set(pattern) - set(BLANKS):
+            hits = [i for i, char in enumerate(pattern) if char == letter]
+            bits = bucket.apply_feedback(bits, letter, hits, unknown if exclusive else [])
+        for letter in excluded - set(pattern):
+            bits = bucket.apply_feedback(bits, letter, [], [])
+        return bucket.words(bits)
+
+    def lengths(self):
+        return sorted(set(self._pending) | set(self.buckets))
+
+    def words(self):
+        words = []
+        for length in self.lengths():
+            if length in self.buckets:
+                bucket = self.buckets[length]
+                words.extend(bucket.words(bucket.full))
+            else:
+                words.extend(self._pending[length])
+        return words
+
+    def save(self, path, **metadata):
+        """
+        Write every bucket to one flat binary file. load() memory-maps it, so
+        any number of processes can share a single read-only copy through the
+        OS page cache instead of each building its own.
+        """
+        layout, offset = [], 0
+        for length in self.lengths():
+            bucket = self.bucket(length)
+            layout.append([length, bucket.size, offset])
+            offset += sum(array.nbytes for array in bucket.arrays())
+
+        header = json.dumps({"version": FORMAT_VERSION, "layout": layout, "data_size": offset, **metadata}).encode()
+        prefix = len(MAGIC) + 8 + len(header)
+        padding = b"\0" * (-prefix % _DATA_ALIGN)
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(MAGIC)
+            file.write(len(header).to_bytes(8, "little"))
+            file.write(header)
+            file.write(padding)
+            for length in self.lengths():
+                for array in self.buckets[length].arrays():
+                    file.write(np.ascontiguousarray(array).tobytes())
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def read_header(path):
+        """Return (header, data_offset) for a compiled index file."""
+        with open(path, "rb") as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a compiled Hangman index")
+            header_length = int.from_bytes(file.read(8), "little")
+            header = json.loads(file.read(header_length))
+        prefix = len(MAGIC) + 8 + header_length
+        return header, prefix + (-prefix % _DATA_ALIGN)
+
+    @classmethod
+    def load(cls, path):
+        header, data_offset = cls.read_header(path)
+        if header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"{path} was written by an incompatible index version")
+
+        if header["data_size"]:
+            data = np.memmap(path, dtype=np.uint8, mode="r", offset=data_offset, shape=(header["data_size"],))
+        else:
+            data = np.zeros(0, dtype=np.uint8)
+
+        index = cls([])
+        for length, size, offset in header["layout"]:
+            index.buckets[length] = LengthBucket.from_buffer(data, offset, size, length)
+        index.path = path
+        index.fingerprint = header.get("source_sha256")
+        return index
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_or_compile(dictionary_path):
+    """
+    Return a WordIndex for a word-list file, memory-mapped from the compiled
+    `<dictionary_path>.idx` next to it when that is still up to date. The
+    compiled file is trusted when the source mtime and size match, or failing
+    that when its SHA-256 does; otherwise the text is parsed and recompiled.
+    """
+    stat = os.stat(dictionary_path)
+    cache_path = dictionary_path + ".idx"
+
+    try:
+        header, _ = WordIndex.read_header(cache_path)
+        if header.get("version") == FORMAT_VERSION and header.get("source_size") == stat.st_size:
+            if header.get("source_mtime_ns") == stat.st_mtime_ns or header.get("source_sha256") == _sha256(dictionary_path):
+                return WordIndex.load(cache_path)
+    except (OSError, ValueError):
+        pass  # Missing or unreadable cache, rebuild it below
+
+    with open(dictionary_path, "r") as file:
+        index = WordIndex([word.strip().upper() for word in file.readlines()])
+
+    fingerprint = _sha256(dictionary_path)
+    try:
+        index.save(cache_path, source_mtime_ns=stat.st_mtime_ns, source_size=stat.st_size,
+                   source_sha256=fingerprint)
+        index.path, index.fingerprint = cache_path, fingerprint
+    except OSError:
+        pass  # Read-only location, keep using the in-memory index
+    return index
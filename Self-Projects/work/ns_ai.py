@@ -1,10 +1,27 @@
+import argparse
+import hashlib
 import json
+import os
+import random
 import re
+import sqlite3
+import threading
+import time
+import unicodedata
+import zlib
+import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
 from rapidfuzz.distance import Levenshtein
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet output is optional
+    pa = pq = None
+
 
 # =============================================================================
 # SECTION 1 - PROMPT GENERATION
@@ -103,6 +120,16 @@ def call_ai_api(prompt: str) -> str:
     raise NotImplementedError("Implement your API call here.")
 
 
+def stub_ai_api(prompt: str, latency: float = 0.2) -> str:
+    """
+    Offline stand-in for call_ai_api: waits `latency` seconds (like a network
+    round trip) and returns an empty extraction. Use it to dry-run the
+    pipeline or load-test the concurrency settings without an API key.
+    """
+    time.sleep(latency)
+    return json.dumps({"individuals": [], "entities": []})
+
+
 # =============================================================================
 # SECTION 3 - JSON CLEANING & PARSING
 # =============================================================================
@@ -233,48 +260,75 @@ TRANSLITERATION_CHARS  = 2    # max edit distance for transliteration leniency
 PROFILE_SIMILARITY_MIN = 45   # below this = profile mismatch flag
 NATIONALITY_SIM_MIN    = 65   # below this = nationality mismatch flag
 
-def find_best_match(subject_name: str, subject_type: str, ai_output: dict):
-    """
-    Search the AI output for the best matching individual or entity.
-    For entities we strip company suffixes before comparing.
+_MATCH_SCORERS = (fuzz.token_sort_ratio, fuzz.token_set_ratio, fuzz.partial_ratio)  # as in name_fuzzy_score
 
-    Returns (matched_record: dict | None, best_score: float)
+def find_best_matches(subjects: list, ai_output: dict, workers: int = 1, score_cutoff: float | None = None) -> list:
     """
-    pool = (
-        ai_output.get("individuals", [])
-        if subject_type.strip().lower() == "individual"
-        else ai_output.get("entities", [])
-    )
+    Batch find_best_match for several (subject_name, subject_type) pairs
+    screened against the same article.
 
-    is_entity = subject_type.strip().lower() != "individual"
-    name_key  = "entity_name" if is_entity else "full_name"
+    All subjects of a type are scored against every extracted name and alias
+    at once with rapidfuzz.process.cdist (one matrix per scorer, `workers`
+    threads; -1 = all cores) and the element-wise maximum is taken, as in
+    name_fuzzy_score. Scores below score_cutoff count as 0.
+
+    Returns [(matched_record: dict | None, best_score: float)] in subject order.
+    """
+    results = [(None, 0.0)] * len(subjects)
+    for is_entity in (False, True):
+        pool = ai_output.get("entities" if is_entity else "individuals", [])
+        name_key = "entity_name" if is_entity else "full_name"
+        rows = [i for i, (_, subject_type) in enumerate(subjects)
+                if (subject_type.strip().lower() != "individual") == is_entity]
+        owners, candidates = [], []
+        for record in pool:
+            for candidate in [record.get(name_key, "")] + record.get("aliases", []):
+                if candidate:
+                    owners.append(record)
+                    candidates.append((_strip_suffixes(candidate) if is_entity else candidate).lower().strip())
+        if not rows or not candidates:
+            continue
 
-    subject_cmp = _strip_suffixes(subject_name) if is_entity else subject_name
+        queries = [(_strip_suffixes(subjects[i][0]) if is_entity else subjects[i][0]).lower().strip() for i in rows]
+        scores = np.maximum.reduce([
+            process.cdist(queries, candidates, scorer=scorer, dtype=np.float64, workers=workers,
+                          score_cutoff=score_cutoff)
+            for scorer in _MATCH_SCORERS
+        ])
+        # argmax picks the first candidate with the top score, like the strict > scan it replaces
+        for row_pos, (i, best) in enumerate(zip(rows, scores.argmax(axis=1))):
+            score = float(scores[row_pos, best])
+            if score > 0:
+                results[i] = (owners[best], score)
+    return results
 
-    best_match, best_score = None, 0.0
 
-    for record in pool:
-        candidates = [record.get(name_key, "")] + record.get("aliases", [])
-        for candidate in candidates:
-            if not candidate:
-                continue
-            cmp_candidate = _strip_suffixes(candidate) if is_entity else candidate
-            score = name_fuzzy_score(subject_cmp, cmp_candidate)
-            if score > best_score:
-                best_score = score
-                best_match = record
+def find_best_match(subject_name: str, subject_type: str, ai_output: dict):
+    """
+    Search the AI output for the best matching individual or entity.
+    For entities we strip company suffixes before comparing.
 
-    return best_match, best_score
+    Returns (matched_record: dict | None, best_score: float)
+    """
+    return find_best_matches([(subject_name, subject_type)], ai_output)[0]
 
 
 # =============================================================================
 # SECTION 6 - DISCOUNTING ENGINE  (Protocols 0-5)
 # =============================================================================
 
-def apply_discounting_rules(row: pd.Series, ai_output: dict) -> dict:
+def subject_of(row: pd.Series) -> tuple:
+    """(subject_name, subject_type) of a screening row, as matched against the article."""
+    return str(row.get("Name", "")).strip(), str(row.get("SubjectType", "Individual")).strip()
+
+
+def apply_discounting_rules(row: pd.Series, ai_output: dict, match: tuple | None = None) -> dict:
     """
     Apply Protocols 0-5 to decide DISCOUNTED or ESCALATE.
 
+    match is this row's (matched_record, score) from find_best_matches when
+    it was already computed for the whole article; otherwise it is looked up.
+
     Returns a dict:
     {
         "subject_name":           str,
@@ -285,8 +339,7 @@ def apply_discounting_rules(row: pd.Series, ai_output: dict) -> dict:
         "matched_article_record": dict | None,
     }
     """
-    subject_name        = str(row.get("Name", "")).strip()
-    subject_type        = str(row.get("SubjectType", "Individual")).strip()
+    subject_name, subject_type = subject_of(row)
     subject_dob         = row.get("DOB")
     subject_nationality = str(row.get("Nationality", "") or "").strip()
     subject_gender_raw  = str(row.get("Gender", "") or "").strip()
@@ -304,7 +357,7 @@ def apply_discounting_rules(row: pd.Series, ai_output: dict) -> dict:
     }
 
     # Find best match
-    matched, score = find_best_match(subject_name, subject_type, ai_output)
+    matched, score = match or find_best_match(subject_name, subject_type, ai_output)
     out["match_score"]            = score
     out["matched_article_record"] = matched
 
@@ -404,85 +457,427 @@ def apply_discounting_rules(row: pd.Series, ai_output: dict) -> dict:
 
 
 # =============================================================================
-# SECTION 7 - MAIN PIPELINE
+# SECTION 7 - CONCURRENT EXTRACTION
 # =============================================================================
 
-def process_screening_file(
-    input_path: str,
-    output_path: str = "screening_results.csv",
-    article_col: str = "News Article",
-):
+class RateLimiter:
     """
-    End-to-end pipeline.
-
-    Reads input_path CSV -> generates prompts -> calls AI -> parses JSON
-    -> applies discounting -> writes output_path CSV.
+    Thread-safe limiter spacing calls at least 1/per_second seconds apart
+    across every worker. per_second=None disables limiting.
     """
-    df = pd.read_csv(input_path)
-    records = []
 
-    for idx, row in df.iterrows():
-        news_article = str(row.get(article_col, "")).strip()
-        subject_name = str(row.get("Name", f"Row {idx}"))
+    def __init__(self, per_second: float | None = None):
+        self.interval = 1.0 / per_second if per_second else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
 
-        print(f"[{idx+1}/{len(df)}] Processing: {subject_name}")
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        time.sleep(slot - now)
 
-        # Step 1: Generate prompt (article only)
-        prompt = generate_extraction_prompt(news_article)
 
-        # Step 2a: Call AI API
+def call_with_retry(api_fn, prompt: str, limiter: RateLimiter, max_retries: int = 3, backoff: float = 1.0) -> str:
+    """
+    Call api_fn(prompt), retrying failures up to max_retries times with
+    exponential backoff (backoff, 2x, 4x ... seconds, plus up to 25% jitter).
+    NotImplementedError is raised straight away - retrying cannot fix it.
+    """
+    for attempt in range(max_retries + 1):
+        limiter.wait()
         try:
-            ai_raw = call_ai_api(prompt)
+            return api_fn(prompt)
         except NotImplementedError:
-            print("  WARNING: call_ai_api() not implemented - skipping row.")
-            records.append({
-                **row.to_dict(),
-                "screening_result":       "ERROR",
-                "discount_reasons":       "API not implemented",
-                "soft_flags":             "",
-                "match_score":            "",
-                "matched_article_record": "",
-                "llm_raw_output":         "",
-            })
-            continue
-        except Exception as exc:
-            print(f"  ERROR - API call failed: {exc}")
-            records.append({
-                **row.to_dict(),
-                "screening_result":       "ERROR",
-                "discount_reasons":       f"API error: {exc}",
-                "soft_flags":             "",
-                "match_score":            "",
-                "matched_article_record": "",
-                "llm_raw_output":         "",
-            })
-            continue
+            raise
+        except Exception:
+            if attempt == max_retries:
+                raise
+            time.sleep(backoff * 2 ** attempt * (1 + 0.25 * random.random()))
 
-        # Step 2b: Parse JSON - separate block so errors are clearly labelled
-        raw_ai_output = ai_raw if isinstance(ai_raw, str) else json.dumps(ai_raw)
-        try:
-            if isinstance(ai_raw, str):
-                ai_output = clean_and_parse_json(ai_raw)
+
+def extract_article(news_article: str, api_fn, limiter: RateLimiter, max_retries: int = 3, backoff: float = 1.0):
+    """
+    Prompt -> API -> parsed JSON for one article. Never raises, so one bad
+    row cannot take down a worker pool.
+
+    Returns (ai_output: dict | None, raw_ai_output: str, error: str | None),
+    where error is the discount_reasons text for an ERROR record.
+    """
+    # Step 1: Generate prompt (article only)
+    prompt = generate_extraction_prompt(news_article)
+
+    # Step 2a: Call AI API
+    try:
+        ai_raw = call_with_retry(api_fn, prompt, limiter, max_retries, backoff)
+    except NotImplementedError:
+        return None, "", "API not implemented"
+    except Exception as exc:
+        return None, "", f"API error: {exc}"
+
+    # Step 2b: Parse JSON - separate block so errors are clearly labelled
+    raw_ai_output = ai_raw if isinstance(ai_raw, str) else json.dumps(ai_raw)
+    try:
+        ai_output = clean_and_parse_json(ai_raw) if isinstance(ai_raw, str) else ai_raw  # else already a dict
+    except Exception as exc:
+        return None, raw_ai_output, f"JSON parse error: {exc}"
+    return ai_output, raw_ai_output, None
+
+
+def extract_articles(articles, api_fn=None, concurrency: int = 1, rate_limit: float | None = None,
+                     max_retries: int = 3, backoff: float = 1.0):
+    """
+    Yield extract_article() results for `articles` in input order.
+
+    With concurrency > 1 the calls run on a thread pool (the API is
+    network-bound, so threads overlap the waiting). rate_limit caps calls per
+    second across all threads, retries included.
+    """
+    api_fn = api_fn or call_ai_api
+    limiter = RateLimiter(rate_limit)
+    if concurrency <= 1:
+        for news_article in articles:
+            yield extract_article(news_article, api_fn, limiter, max_retries, backoff)
+        return
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        yield from pool.map(lambda a: extract_article(a, api_fn, limiter, max_retries, backoff), articles)
+
+
+# =============================================================================
+# SECTION 8 - EXTRACTION CACHE
+# =============================================================================
+
+# Bump whenever generate_extraction_prompt changes, so cached extractions made
+# with the old prompt are no longer found
+PROMPT_VERSION = 1
+
+
+def normalize_article(news_article: str) -> str:
+    """Canonical article text: Unicode NFKC with all whitespace runs collapsed."""
+    return " ".join(unicodedata.normalize("NFKC", news_article).split())
+
+
+def article_key(news_article: str) -> str:
+    """Content address of an article's extraction: sha256 of prompt version + normalized text."""
+    return hashlib.sha256(f"{PROMPT_VERSION}\n{normalize_article(news_article)}".encode("utf-8")).hexdigest()
+
+
+class ExtractionCache:
+    """
+    Persistent SQLite store of parsed ai_output dicts keyed by article_key().
+    Only successful extractions are stored. Once the stored JSON exceeds
+    max_bytes, the least recently used entries are evicted.
+    """
+
+    def __init__(self, path: str = "extraction_cache.sqlite", max_bytes: int = 512 * 2**20):
+        self.max_bytes = max_bytes
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS extractions ("
+            " key TEXT PRIMARY KEY, ai_output TEXT NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS extractions_last_used ON extractions (last_used)")
+        self.total_bytes = self._stored_bytes()  # Kept up to date by put(), so eviction only runs when over
+
+    def get(self, key: str) -> dict | None:
+        row = self.conn.execute("SELECT ai_output FROM extractions WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        with self.conn:
+            self.conn.execute("UPDATE extractions SET last_used = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def _stored_bytes(self) -> int:
+        return self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM extractions").fetchone()[0]
+
+    def put(self, key: str, ai_output: dict):
+        payload = json.dumps(ai_output)
+        with self.conn:
+            replaced = self.conn.execute("SELECT size FROM extractions WHERE key = ?", (key,)).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO extractions (key, ai_output, size, last_used) VALUES (?, ?, ?, ?)",
+                (key, payload, len(payload), time.time()),
+            )
+            self.total_bytes += len(payload) - (replaced[0] if replaced else 0)
+            if self.total_bytes <= self.max_bytes:
+                return
+            # Keep the most recently used entries whose running total fits in max_bytes
+            self.conn.execute(
+                "DELETE FROM extractions WHERE key IN ("
+                " SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY last_used DESC) AS kept FROM extractions)"
+                " WHERE kept > ?)",
+                (self.max_bytes,),
+            )
+            self.total_bytes = self._stored_bytes()  # Also picks up writes from other processes sharing the file
+
+    def close(self):
+        self.conn.close()
+
+
+# =============================================================================
+# SECTION 9 - ARTICLE DEDUPLICATION
+# =============================================================================
+
+_MINHASH_PRIME = (1 << 31) - 1  # Small enough that a * hash + b stays inside uint64
+
+
+def minhash_signatures(texts: list, num_perm: int = 128, shingle_words: int = 5, seed: int = 1) -> np.ndarray:
+    """
+    MinHash signature (num_perm uint64 values) of each text's set of
+    `shingle_words`-word shingles. The fraction of equal positions between
+    two signatures estimates the Jaccard similarity of their shingle sets.
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, _MINHASH_PRIME, num_perm, dtype=np.uint64)
+    b = rng.integers(0, _MINHASH_PRIME, num_perm, dtype=np.uint64)
+    signatures = np.empty((len(texts), num_perm), dtype=np.uint64)
+    for i, text in enumerate(texts):
+        words = normalize_article(text).lower().split()
+        shingles = {" ".join(words[j:j + shingle_words]) for j in range(max(len(words) - shingle_words + 1, 1))}
+        hashes = np.array([zlib.crc32(sh.encode("utf-8")) for sh in shingles], dtype=np.uint64) % _MINHASH_PRIME
+        signatures[i] = ((a[:, None] * hashes[None, :] + b[:, None]) % _MINHASH_PRIME).min(axis=1)
+    return signatures
+
+
+def group_articles(articles: list, near_duplicate_threshold: float | None = None, bands: int = 32) -> list:
+    """
+    Map every article to the index of the first article in its group.
+
+    Articles with the same article_key() always share a group. With
+    near_duplicate_threshold set, distinct articles whose estimated shingle
+    Jaccard similarity reaches it (syndicated copies of one wire story) are
+    merged too; candidate pairs come from MinHash LSH over `bands` bands.
+    """
+    first_by_key = {}
+    groups = [first_by_key.setdefault(article_key(a), i) for i, a in enumerate(articles)]
+    if not near_duplicate_threshold:
+        return groups
+
+    unique = sorted(set(groups))
+    signatures = minhash_signatures([articles[i] for i in unique])
+    parent = list(range(len(unique)))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    rows = signatures.shape[1] // bands
+    for band in range(bands):
+        buckets = {}
+        for u, signature in enumerate(signatures):
+            buckets.setdefault(signature[band * rows:(band + 1) * rows].tobytes(), []).append(u)
+        for members in buckets.values():
+            for u in members[1:]:
+                first, other = find(members[0]), find(u)
+                if first != other and (signatures[members[0]] == signatures[u]).mean() >= near_duplicate_threshold:
+                    parent[max(first, other)] = min(first, other)  # The root stays the earliest article
+
+    position = {g: u for u, g in enumerate(unique)}
+    return [unique[find(position[g])] for g in groups]
+
+
+# =============================================================================
+# SECTION 10 - PROGRESS JOURNAL
+# =============================================================================
+
+def row_identity(row: pd.Series) -> str:
+    """
+    Content hash of an input row. Integral floats are written as ints, so a
+    column read as float in one chunk (because of a NaN) and int in another
+    hashes the same. process_screening_file appends "-<n>" for the n-th
+    repeat of identical rows to make the row_id unique.
+    """
+    values = [int(v) if isinstance(v, float) and v.is_integer() else v for v in row.tolist()]
+    return hashlib.sha256(json.dumps([str(v) for v in values]).encode("utf-8")).hexdigest()[:20]
+
+
+class ProgressJournal:
+    """
+    Append-only record of finished rows, one "row_id<TAB>screening_result"
+    line each, flushed and fsynced after every chunk. On resume the last
+    entry per row wins, and rows whose last result is not ERROR count as
+    completed. A last line torn by a crash is cut off.
+    """
+
+    def __init__(self, path: str, resume: bool = False):
+        results = {}
+        if resume and os.path.exists(path):
+            with open(path, "rb+") as file:
+                data = file.read()
+                data = data[:data.rfind(b"\n") + 1]
+                file.truncate(len(data))
+            for line in data.decode("utf-8").splitlines():
+                row_id, result = line.split("\t")
+                results[row_id] = result
+        self.completed = {row_id for row_id, result in results.items() if result != "ERROR"}
+        self.file = open(path, "a" if resume else "w", encoding="utf-8")
+
+    def record(self, row_ids, results):
+        self.file.writelines(f"{row_id}\t{result}\n" for row_id, result in zip(row_ids, results))
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+
+def keep_completed_rows(output_path: str, completed: set, chunksize: int = 10_000):
+    """
+    Rewrite a CSV output in place keeping only rows whose row_id is in
+    completed, so a resumed run can append without duplicating or keeping
+    ERROR rows. Values are copied as text, untouched.
+    """
+    tmp_path = output_path + ".tmp"
+    chunks = pd.read_csv(output_path, chunksize=chunksize, dtype=str, keep_default_na=False)
+    for i, chunk in enumerate(chunks):
+        if "row_id" not in chunk:
+            raise ValueError(f"{output_path} has no row_id column; it was not written with a journal")
+        chunk[chunk["row_id"].isin(completed)].to_csv(tmp_path, mode="a" if i else "w", header=not i, index=False)
+    os.replace(tmp_path, output_path)
+
+
+# =============================================================================
+# SECTION 11 - MAIN PIPELINE
+# =============================================================================
+
+# Fixed dtypes of the columns screening adds, so every chunk of output has the same schema
+RESULT_DTYPES = {
+    "screening_result":       str,
+    "discount_reasons":       str,
+    "soft_flags":             str,
+    "match_score":            "float64",
+    "matched_article_record": str,
+    "llm_raw_output":         str,
+}
+
+
+def _error_record(row: pd.Series, reason: str, raw_ai_output: str = "") -> dict:
+    return {
+        **row.to_dict(),
+        "screening_result":       "ERROR",
+        "discount_reasons":       reason,
+        "soft_flags":             "",
+        "match_score":            None,
+        "matched_article_record": "",
+        "llm_raw_output":         raw_ai_output,  # save raw for debugging
+    }
+
+
+class ResultWriter:
+    """
+    Appends screening results to output_path chunk by chunk, so finished
+    rows are on disk as soon as their chunk is done. Writes Parquet when the
+    path ends in .parquet (needs pyarrow), CSV otherwise. Result columns
+    get RESULT_DTYPES; in Parquet the input columns are stored as text.
+    """
+
+    def __init__(self, output_path: str, append: bool = False):
+        self.output_path = output_path
+        self.parquet = output_path.lower().endswith(".parquet")
+        if self.parquet and pq is None:
+            raise ImportError("Parquet output needs pyarrow: pip install pyarrow")
+        if self.parquet and append:
+            raise ValueError("Parquet output cannot be appended to; resume needs CSV output")
+        self.writer = None  # ParquetWriter, opened with the first chunk's schema
+        # Appending to a CSV that already has its header
+        self.started = append and os.path.exists(output_path) and os.path.getsize(output_path) > 0
+
+    def write(self, out_df: pd.DataFrame):
+        out_df = out_df.astype({col: dtype for col, dtype in RESULT_DTYPES.items() if col in out_df})
+        if self.parquet:
+            # Input columns can be inferred differently per chunk (all-NaN float vs text), so store them as text
+            out_df = out_df.astype({col: "string" for col in out_df if col not in RESULT_DTYPES})
+            if self.writer is None:
+                table = pa.Table.from_pandas(out_df, preserve_index=False)
+                self.writer = pq.ParquetWriter(self.output_path, table.schema)
             else:
-                ai_output = ai_raw  # already a dict
-        except Exception as exc:
-            print(f"  ERROR - JSON parse failed: {exc}")
-            records.append({
-                **row.to_dict(),
-                "screening_result":       "ERROR",
-                "discount_reasons":       f"JSON parse error: {exc}",
-                "soft_flags":             "",
-                "match_score":            "",
-                "matched_article_record": "",
-                "llm_raw_output":         raw_ai_output,  # save raw for debugging
-            })
+                table = pa.Table.from_pandas(out_df, schema=self.writer.schema, preserve_index=False)
+            self.writer.write_table(table)
+        else:
+            out_df.to_csv(self.output_path, mode="a" if self.started else "w", header=not self.started, index=False)
+        self.started = True
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def screen_chunk(
+    df: pd.DataFrame,
+    article_col: str = "News Article",
+    api_fn=None,
+    concurrency: int = 1,
+    rate_limit: float | None = None,
+    max_retries: int = 3,
+    cache: ExtractionCache | None = None,
+    near_duplicate_threshold: float | None = None,
+    match_workers: int = 1,
+    total_rows: int | str = "?",
+):
+    """
+    Screen the rows of df, yielding one output record per row in order as
+    soon as that row's result is final.
+
+    Rows are grouped with group_articles() first and each group's article is
+    extracted once, its result shared by every subject in the group; pass
+    near_duplicate_threshold to also merge near-identical copies of a story.
+    All subjects of a group are name-matched in one find_best_matches call
+    using match_workers threads.
+    """
+    articles = [str(row.get(article_col, "")).strip() for _, row in df.iterrows()]
+    groups = group_articles(articles, near_duplicate_threshold)
+    firsts = sorted(set(groups))
+    print(f"{len(firsts)} unique articles for {len(df)} rows")
+    members = {}
+    for pos, first in enumerate(groups):
+        members.setdefault(first, []).append(pos)
+    subjects = [subject_of(row) for _, row in df.iterrows()]
+    matches = {}  # row position -> (matched_record, score), filled a group at a time
+
+    # Extraction (ai_output, raw, error) per group, keyed by the group's first row
+    results = {}
+    if cache:
+        for first in firsts:
+            hit = cache.get(article_key(articles[first]))
+            if hit is not None:
+                results[first] = (hit, json.dumps(hit), None)
+    misses = [first for first in firsts if first not in results]
+    extractions = zip(misses, extract_articles([articles[first] for first in misses], api_fn, concurrency,
+                                               rate_limit, max_retries))
+
+    for pos, ((idx, row), first) in enumerate(zip(df.iterrows(), groups)):
+        subject_name = str(row.get("Name", f"Row {idx}"))
+        print(f"[{idx+1}/{total_rows}] Processing: {subject_name}")
+
+        # A group's first row never comes after its members, so its extraction is due by now
+        while first not in results:
+            done, extraction = next(extractions)
+            results[done] = extraction
+            if cache and extraction[2] is None:
+                cache.put(article_key(articles[done]), extraction[0])
+        ai_output, raw_ai_output, error = results[first]
+
+        if error is not None:
+            print(f"  ERROR - {error}")
+            yield _error_record(row, error, raw_ai_output)
             continue
 
+        if pos not in matches:
+            group = members[first]
+            matches.update(zip(group, find_best_matches([subjects[p] for p in group], ai_output, match_workers)))
+
         # Step 3: Local discounting
-        result = apply_discounting_rules(row, ai_output)
+        result = apply_discounting_rules(row, ai_output, matches.pop(pos))
         print(f"  -> {result['result']}  |  reasons: {result['discount_reasons']}")
 
-        records.append({
+        yield {
             **row.to_dict(),
             "screening_result":       result["result"],
             "discount_reasons":       " | ".join(result["discount_reasons"]),
@@ -490,12 +885,117 @@ def process_screening_file(
             "match_score":            round(result["match_score"], 1),
             "matched_article_record": json.dumps(result["matched_article_record"]),
             "llm_raw_output":         raw_ai_output,
-        })
+        }
+
+
+def process_screening_file(
+    input_path: str,
+    output_path: str = "screening_results.csv",
+    article_col: str = "News Article",
+    api_fn=None,
+    concurrency: int = 1,
+    rate_limit: float | None = None,
+    max_retries: int = 3,
+    cache_path: str | None = None,
+    cache_max_bytes: int = 512 * 2**20,
+    near_duplicate_threshold: float | None = None,
+    match_workers: int = 1,
+    chunksize: int | None = None,
+    journal_path: str | None = None,
+    resume: bool = False,
+):
+    """
+    End-to-end pipeline.
+
+    Reads input_path CSV -> generates prompts -> calls AI -> parses JSON
+    -> applies discounting -> writes output_path (CSV, or Parquet when it
+    ends in .parquet).
+
+    api_fn defaults to call_ai_api; pass stub_ai_api (or any str -> str
+    callable) to run offline. concurrency, rate_limit and max_retries are
+    passed to extract_articles; output rows keep the input order. See
+    screen_chunk for near_duplicate_threshold and match_workers.
+
+    With cache_path set, extractions are looked up in / saved to an
+    ExtractionCache there, so re-runs and repeated articles skip the API.
+    A cache hit's llm_raw_output is the cached ai_output as JSON.
+
+    With chunksize set, the input is streamed chunksize rows at a time and
+    each chunk's results are appended to output_path before the next is
+    read, so memory stays bounded and a crashed run keeps what it finished.
+    Articles are only deduplicated within a chunk; use a cache to share
+    extractions between chunks. Returns the output DataFrame, or None when
+    streaming.
+
+    With journal_path set, each output row gets a row_id (row_identity()
+    plus a repeat counter) and is logged in a ProgressJournal right after it
+    is written; CSV output is then written row by row, so an interrupted run
+    loses at most the row in flight. resume=True then continues an interrupted
+    run: the CSV output is cut back to the journaled non-ERROR rows, those
+    rows are skipped, and everything else (ERROR rows included) is screened
+    again and appended after them. Pair it with cache_path so re-screened
+    rows whose extraction succeeded before do not hit the API again.
+    """
+    if resume and not journal_path:
+        raise ValueError("resume needs a journal_path")
+    writer = ResultWriter(output_path, append=resume)
+    journal = ProgressJournal(journal_path, resume) if journal_path else None
+    if resume and os.path.exists(output_path):
+        keep_completed_rows(output_path, journal.completed)
+        print(f"Resuming: {len(journal.completed)} rows already completed")
+    cache = ExtractionCache(cache_path, cache_max_bytes) if cache_path else None
+    if chunksize:
+        chunks, total_rows = pd.read_csv(input_path, chunksize=chunksize), "?"
+    else:
+        df = pd.read_csv(input_path)
+        chunks, total_rows = [df], len(df)
+
+    frames = []  # Everything written, kept only to return it when not streaming
+    repeats = {}  # row_identity -> rows seen with it so far
+    flush_every = 1 if journal and not writer.parquet else None  # Parquet row groups want whole chunks
+
+    def flush(records, row_ids):
+        out_df = pd.DataFrame(records)
+        if journal:
+            out_df.insert(0, "row_id", row_ids)
+        writer.write(out_df)
+        if journal:
+            journal.record(row_ids, out_df["screening_result"])
+        if not chunksize:
+            frames.append(out_df)
 
-    out_df = pd.DataFrame(records)
-    out_df.to_csv(output_path, index=False)
+    try:
+        for chunk in chunks:
+            if journal:
+                row_ids = []
+                for _, row in chunk.iterrows():
+                    identity = row_identity(row)
+                    repeats[identity] = repeats.get(identity, -1) + 1
+                    row_ids.append(f"{identity}-{repeats[identity]}")
+                todo = [row_id not in journal.completed for row_id in row_ids]
+                chunk, row_ids = chunk[todo], [row_id for row_id, keep in zip(row_ids, todo) if keep]
+                if chunk.empty:
+                    continue
+            else:
+                row_ids = None
+
+            records = []
+            for record in screen_chunk(chunk, article_col, api_fn, concurrency, rate_limit, max_retries, cache,
+                                       near_duplicate_threshold, match_workers, total_rows):
+                records.append(record)
+                if flush_every and len(records) == flush_every:
+                    flush(records, row_ids[:len(records)])
+                    row_ids, records = row_ids[len(records):], []
+            if records:
+                flush(records, row_ids)
+    finally:
+        writer.close()
+        if cache:
+            cache.close()
+        if journal:
+            journal.close()
     print(f"\nResults written to: {output_path}")
-    return out_df
+    return None if chunksize else pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
 
 
 # =============================================================================
@@ -503,7 +1003,38 @@ def process_screening_file(
 # =============================================================================
 
 if __name__ == "__main__":
-    import sys
-    input_file  = sys.argv[1] if len(sys.argv) > 1 else "screening_input.csv"
-    output_file = sys.argv[2] if len(sys.argv) > 2 else "screening_results.csv"
-    process_screening_file(input_file, output_file)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="AI-assisted name-screening discounting.")
+    parser.add_argument("input_file", nargs="?", default="screening_input.csv")
+    parser.add_argument("output_file", nargs="?", default="screening_results.csv")
+    parser.add_argument("--concurrency", type=int, default=1, help="parallel API calls")
+    parser.add_argument("--rate-limit", type=float, default=None, help="max API calls per second")
+    parser.add_argument("--retries", type=int, default=3, help="retries per failed API call")
+    parser.add_argument("--stub-api", action="store_true", help="use stub_ai_api instead of call_ai_api")
+    parser.add_argument("--cache", metavar="PATH", default=None, help="SQLite extraction cache to read and fill")
+    parser.add_argument("--cache-max-mb", type=float, default=512, help="evict least recently used past this size")
+    parser.add_argument("--near-duplicates", metavar="JACCARD", type=float, default=None,
+                        help="also extract near-identical articles once (e.g. 0.8)")
+    parser.add_argument("--match-workers", type=int, default=1, help="threads for name matching (-1 = all cores)")
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="stream the input this many rows at a time, appending results as they finish")
+    parser.add_argument("--journal", metavar="PATH", default=None,
+                        help="log finished rows here (default for CSV output: OUTPUT_FILE.journal)")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue an interrupted run: skip journaled rows, retry ERROR rows")
+    args = parser.parse_args()
+
+    process_screening_file(
+        args.input_file, args.output_file,
+        api_fn=stub_ai_api if args.stub_api else None,
+        concurrency=args.concurrency,
+        rate_limit=args.rate_limit,
+        max_retries=args.retries,
+        cache_path=args.cache,
+        cache_max_bytes=int(args.cache_max_mb * 2**20),
+        near_duplicate_threshold=args.near_duplicates,
+        match_workers=args.match_workers,
+        chunksize=args.chunksize,
+        journal_path=args.journal or (None if args.output_file.lower().endswith(".parquet")
+                                      else args.output_file + ".journal"),
+        resume=args.resume,
+    )
\ No newline at end of file